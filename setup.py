@@ -19,12 +19,10 @@ setup(
         "Topic :: System :: Networking",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.8",
-        "Programming Language :: Python :: 3.9",
-        "Programming Language :: Python :: 3.10",
         "Programming Language :: Python :: 3.11",
     ],
-    python_requires=">=3.8",
+    # asyncio.timeout in network.py needs 3.11
+    python_requires=">=3.11",
     install_requires=[
         "cryptography>=41.0.0",
         "pynacl>=1.5.0",
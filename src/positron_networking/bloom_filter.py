@@ -8,7 +8,12 @@ but false negatives are not.
 import math
 import hashlib
 import struct
-from typing import Optional, List
+from typing import Optional, List, Union
+
+
+# Splits one 128-bit digest into the two 64-bit halves used for
+# double hashing
+_PAIR_UNPACK = struct.Struct('<QQ').unpack
 
 
 class BloomFilter:
@@ -60,26 +65,27 @@ class BloomFilter:
         num_hashes = (m / n) * math.log(2)
         return max(1, int(math.ceil(num_hashes)))
     
-    def _hash(self, item: str, seed: int) -> int:
+    @staticmethod
+    def _hash_pair(item: Union[str, bytes]) -> tuple:
         """
-        Generate a hash value for an item with a given seed.
-        
+        Generate the two 64-bit hash halves for an item.
+
+        One 128-bit blake2b digest replaces a seeded SHA-256 call per
+        hash function; the k bit positions are derived from the two
+        halves by double hashing (h1 + i*h2). A Bloom filter needs
+        uniformity, not cryptographic strength, and blake2b is the
+        fastest keyless hash in hashlib.
+
         Args:
-            item: String to hash
-            seed: Seed for hash function
-            
+            item: String or bytes to hash
+
         Returns:
-            Hash value in range [0, size)
+            (h1, h2) tuple; h2 is forced odd so the probe sequence
+            never degenerates to a single position
         """
-        # Use SHA-256 with seed for cryptographic strength
-        hasher = hashlib.sha256()
-        hasher.update(struct.pack('I', seed))
-        hasher.update(item.encode('utf-8'))
-        hash_bytes = hasher.digest()
-        
-        # Convert first 8 bytes to integer
-        hash_int = struct.unpack('Q', hash_bytes[:8])[0]
-        return hash_int % self.size
+        data = item if isinstance(item, bytes) else item.encode('utf-8')
+        h1, h2 = _PAIR_UNPACK(hashlib.blake2b(data, digest_size=16).digest())
+        return h1, h2 | 1
     
     def _set_bit(self, position: int) -> None:
         """Set a bit at the given position."""
@@ -93,36 +99,106 @@ class BloomFilter:
         bit_index = position % 8
         return bool(self.bit_array[byte_index] & (1 << bit_index))
     
-    def add(self, item: str) -> None:
+    def add(self, item: Union[str, bytes]) -> None:
         """
         Add an item to the Bloom filter.
         
         Args:
             item: String to add to the filter
         """
-        for seed in range(self.num_hashes):
-            position = self._hash(item, seed)
-            self._set_bit(position)
-        self.num_items += 1
+        h1, h2 = self._hash_pair(item)
+        self._add_pair(h1, h2)
     
-    def contains(self, item: str) -> bool:
+    def contains(self, item: Union[str, bytes]) -> bool:
         """
         Check if an item might be in the set.
-        
+
         Args:
             item: String to check
-            
+
         Returns:
             True if the item might be in the set (possible false positive),
             False if the item is definitely not in the set
         """
-        for seed in range(self.num_hashes):
-            position = self._hash(item, seed)
-            if not self._get_bit(position):
+        h1, h2 = self._hash_pair(item)
+        return self._contains_pair(h1, h2)
+
+    def _add_pair(self, h1: int, h2: int) -> None:
+        """Set the k positions derived from an already-hashed item."""
+        size = self.size
+        for i in range(self.num_hashes):
+            self._set_bit((h1 + i * h2) % size)
+        self.num_items += 1
+
+    def _contains_pair(self, h1: int, h2: int) -> bool:
+        """Probe the k positions derived from an already-hashed item."""
+        size = self.size
+        bit_array = self.bit_array
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % size
+            if not bit_array[position >> 3] & (1 << (position & 7)):
                 return False
         return True
+
+    def add_many(self, items) -> None:
+        """
+        Add a batch of items to the Bloom filter.
+
+        Equivalent to calling add() per item, but with the hashing and
+        bit writes inlined over locals so the per-item cost is the hash
+        calls rather than interpreter dispatch.
+
+        Args:
+            items: Iterable of strings or bytes to add
+        """
+        bit_array = self.bit_array
+        size = self.size
+        hash_range = range(self.num_hashes)
+        blake2b = hashlib.blake2b
+        unpack = _PAIR_UNPACK
+        count = 0
+        for item in items:
+            data = item if isinstance(item, bytes) else item.encode('utf-8')
+            h1, h2 = unpack(blake2b(data, digest_size=16).digest())
+            h2 |= 1
+            for i in hash_range:
+                position = (h1 + i * h2) % size
+                bit_array[position >> 3] |= 1 << (position & 7)
+            count += 1
+        self.num_items += count
+
+    def contains_many(self, items) -> List[bool]:
+        """
+        Check a batch of items for membership.
+
+        Args:
+            items: Iterable of strings or bytes to check
+
+        Returns:
+            One bool per item, in input order; True means the item
+            might be in the set, False means it definitely is not
+        """
+        bit_array = self.bit_array
+        size = self.size
+        hash_range = range(self.num_hashes)
+        blake2b = hashlib.blake2b
+        unpack = _PAIR_UNPACK
+        results = []
+        append = results.append
+        for item in items:
+            data = item if isinstance(item, bytes) else item.encode('utf-8')
+            h1, h2 = unpack(blake2b(data, digest_size=16).digest())
+            h2 |= 1
+            for i in hash_range:
+                position = (h1 + i * h2) % size
+                if not bit_array[position >> 3] & (1 << (position & 7)):
+                    append(False)
+                    break
+            else:
+                append(True)
+        return results
     
-    def __contains__(self, item: str) -> bool:
+    def __contains__(self, item: Union[str, bytes]) -> bool:
         """Support 'in' operator."""
         return self.contains(item)
     
@@ -286,7 +362,7 @@ class ScalableBloomFilter:
         
         self.filters.append(BloomFilter(capacity, fpr))
     
-    def add(self, item: str) -> None:
+    def add(self, item: Union[str, bytes]) -> None:
         """
         Add an item to the scalable Bloom filter.
         
@@ -296,10 +372,11 @@ class ScalableBloomFilter:
         # Check if current filter is full
         if self.filters[-1].is_full():
             self._add_filter()
-        
-        self.filters[-1].add(item)
+
+        h1, h2 = BloomFilter._hash_pair(item)
+        self.filters[-1]._add_pair(h1, h2)
     
-    def contains(self, item: str) -> bool:
+    def contains(self, item: Union[str, bytes]) -> bool:
         """
         Check if an item might be in the set.
         
@@ -309,9 +386,16 @@ class ScalableBloomFilter:
         Returns:
             True if item might be in set, False if definitely not
         """
-        return any(bf.contains(item) for bf in self.filters)
+        # Hash once and probe every sub-filter with the same halves;
+        # the positions differ per filter only through its size.
+        # Newest filter first: recent items are the likeliest hits
+        h1, h2 = BloomFilter._hash_pair(item)
+        for bf in reversed(self.filters):
+            if bf._contains_pair(h1, h2):
+                return True
+        return False
     
-    def __contains__(self, item: str) -> bool:
+    def __contains__(self, item: Union[str, bytes]) -> bool:
         """Support 'in' operator."""
         return self.contains(item)
     
@@ -247,7 +247,7 @@ class GossipProtocol:
                 # Yield to event loop
                 await asyncio.sleep(0)
     
-    async def _has_seen(self, message_id: str) -> bool:
+    async def _has_seen(self, message_id: bytes) -> bool:
         """
         Check if we've seen a message before.
         
@@ -278,7 +278,7 @@ class GossipProtocol:
             # Check persistent storage
             return await self.storage.has_seen_message(message_id)
     
-    async def _mark_seen(self, message_id: str):
+    async def _mark_seen(self, message_id: bytes):
         """
         Mark a message as seen.
         
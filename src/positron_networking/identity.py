@@ -1,12 +1,35 @@
 """
 Cryptographic identity management using Ed25519 signatures.
 """
+from collections import OrderedDict
 from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.hazmat.primitives import serialization
 from cryptography.exceptions import InvalidSignature
 import os
 import hashlib
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
+
+
+# Constructed Ed25519PublicKey objects cached by their raw bytes: the
+# verify paths see the same few peer keys over and over, and rebuilding
+# the key object costs more than the cache lookup. LRU-bounded so
+# synthesized keys cannot grow it without limit.
+_PUBKEY_CACHE_SIZE = 1024
+_pubkey_cache: 'OrderedDict[bytes, ed25519.Ed25519PublicKey]' = OrderedDict()
+
+
+def _public_key_from_bytes(public_key_bytes: bytes) -> ed25519.Ed25519PublicKey:
+    """Construct (or fetch a cached) public key object from raw bytes."""
+    cache = _pubkey_cache
+    key = cache.get(public_key_bytes)
+    if key is not None:
+        cache.move_to_end(public_key_bytes)
+        return key
+    key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
+    if len(cache) >= _PUBKEY_CACHE_SIZE:
+        cache.popitem(last=False)
+    cache[public_key_bytes] = key
+    return key
 
 
 class Identity:
@@ -63,12 +86,48 @@ class Identity:
             True if signature is valid, False otherwise
         """
         try:
-            public_key = ed25519.Ed25519PublicKey.from_public_bytes(public_key_bytes)
+            public_key = _public_key_from_bytes(public_key_bytes)
             public_key.verify(signature, data)
             return True
         except (InvalidSignature, Exception):
             return False
-    
+
+    @staticmethod
+    def verify_batch(
+        public_keys: List[bytes],
+        messages: List[bytes],
+        signatures: List[bytes]
+    ) -> List[bool]:
+        """
+        Verify a batch of signatures.
+
+        Args:
+            public_keys: Raw public key bytes, one per signature
+            messages: Signed messages, one per signature
+            signatures: Signatures to verify
+
+        Returns:
+            One bool per input triple, in order
+
+        The batch is verified per item — the underlying library exposes
+        no curve arithmetic, so a true random-linear-combination batch
+        verification cannot be built on top of it — but key-object
+        construction is cached across the batch and the loop overhead
+        is paid once, which is where the Python-side cost sits. The
+        signature accepts whole batches so a batch-capable backend can
+        slot in behind it without touching callers.
+        """
+        key_from_bytes = _public_key_from_bytes
+        results = []
+        append = results.append
+        for key_bytes, message, signature in zip(public_keys, messages, signatures):
+            try:
+                key_from_bytes(key_bytes).verify(signature, message)
+                append(True)
+            except (InvalidSignature, Exception):
+                append(False)
+        return results
+
     def get_public_key_bytes(self) -> bytes:
         """
         Get the public key as raw bytes.
@@ -37,18 +37,24 @@ class Connection:
     async def send_message(self, message: Message):
         """
         Send a message over this connection.
-        
+
         Args:
             message: Message to send
         """
+        await self.send_raw(message.to_bytes())
+
+    async def send_raw(self, data: bytes):
+        """
+        Send pre-serialized message bytes over this connection.
+
+        Args:
+            data: Serialized message bytes
+        """
         async with self._lock:
             if not self.is_open:
                 raise ConnectionError("Connection is closed")
-            
+
             try:
-                # Serialize message
-                data = message.to_bytes()
-                
                 # Send length prefix (4 bytes, big-endian)
                 length = struct.pack(">I", len(data))
                 self.writer.write(length + data)
@@ -265,10 +271,10 @@ class NetworkTransport:
                 f"{self.host}:{self.port}"
             )
             
-            # Sign the handshake
-            handshake.signature = self.identity.sign(handshake.get_signable_data())
-            
-            await connection.send_message(handshake)
+            # Sign and serialize in one pass
+            await connection.send_raw(
+                handshake.sign_and_serialize(self.identity.sign)
+            )
             
             # Wait for handshake ack
             async with asyncio.timeout(self.connection_timeout):
@@ -334,10 +340,8 @@ class NetworkTransport:
                 peer_ids
             )
             
-            # Sign the ack
-            ack.signature = self.identity.sign(ack.get_signable_data())
-            
-            await connection.send_message(ack)
+            # Sign and serialize in one pass
+            await connection.send_raw(ack.sign_and_serialize(self.identity.sign))
             
             return True
             
@@ -384,34 +388,46 @@ class NetworkTransport:
             return False
         
         try:
-            # Sign message
-            message.signature = self.identity.sign(message.get_signable_data())
-            await connection.send_message(message)
+            # Sign and serialize in one pass
+            await connection.send_raw(message.sign_and_serialize(self.identity.sign))
             return True
         except Exception as e:
             print(f"Failed to send to {node_id}: {e}")
             return False
-    
+
     async def broadcast_to_peers(self, message: Message, peer_ids: Optional[list] = None):
         """
         Broadcast a message to multiple peers.
-        
+
         Args:
             message: Message to broadcast
             peer_ids: List of peer IDs to send to (None = all peers)
         """
-        # Sign message once
-        message.signature = self.identity.sign(message.get_signable_data())
-        
+        # Sign and serialize once, then fan the same bytes out to every peer
+        data = message.sign_and_serialize(self.identity.sign)
+
         targets = peer_ids if peer_ids else list(self.connections.keys())
-        
+
         send_tasks = [
-            self.send_to_peer(peer_id, message)
+            self._send_raw_to_peer(peer_id, data)
             for peer_id in targets
         ]
-        
+
         if send_tasks:
             await asyncio.gather(*send_tasks, return_exceptions=True)
+
+    async def _send_raw_to_peer(self, node_id: str, data: bytes) -> bool:
+        """Send pre-serialized message bytes to a specific peer."""
+        connection = self.connections.get(node_id)
+        if not connection or not connection.is_open:
+            return False
+
+        try:
+            await connection.send_raw(data)
+            return True
+        except Exception as e:
+            print(f"Failed to send to {node_id}: {e}")
+            return False
     
     def _parse_address(self, address: str) -> Tuple[str, int]:
         """Parse address string into host and port."""
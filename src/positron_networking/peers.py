@@ -81,8 +81,7 @@ class PeerManager:
     
     async def _load_known_peers(self):
         """Load known peers from storage."""
-        peers = await self.storage.get_all_peers()
-        for peer in peers:
+        async for peer in self.storage.iter_all_peers():
             if peer.node_id != self.node_id:
                 self.known_peers[peer.node_id] = peer
     
@@ -2,13 +2,31 @@
 Network protocol message types and serialization.
 """
 from enum import IntEnum
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import ClassVar, List, Dict, Any, Optional
 import msgpack
 import time
 import hashlib
 
 
+def _pack_default(obj):
+    """Teach the packer to serialize PeerInfo as its (memoized) dict."""
+    if isinstance(obj, PeerInfo):
+        return obj.to_dict()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+# Shared packer reused across serializations. Building the buffer field by
+# field avoids allocating an intermediate dict per message, and reusing one
+# Packer avoids per-call buffer churn. All serialization happens on the
+# event loop thread, so sharing a single instance is safe.
+_packer = msgpack.Packer(use_bin_type=True, autoreset=False, default=_pack_default)
+
+# Unpack options shared by every decode path so they stay consistent with
+# the packer configuration above.
+_UNPACK_KW = dict(raw=False)
+
+
 class MessageType(IntEnum):
     """Types of messages in the network."""
     HANDSHAKE = 1
@@ -37,7 +55,7 @@ class MessageType(IntEnum):
     DHT_DELETE_RESPONSE = 22
 
 
-@dataclass
+@dataclass(slots=True)
 class PeerInfo:
     """Information about a peer."""
     node_id: str
@@ -45,16 +63,30 @@ class PeerInfo:
     public_key: bytes
     last_seen: float = field(default_factory=time.time)
     trust_score: float = 0.5
-    
+    # Memoized to_dict result; cleared whenever any field changes so
+    # peer announcements don't rebuild N identical dicts per broadcast.
+    _cached_dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != "_cached_dict":
+            object.__setattr__(self, "_cached_dict", None)
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for serialization."""
-        return {
-            "node_id": self.node_id,
-            "address": self.address,
-            "public_key": self.public_key,
-            "last_seen": self.last_seen,
-            "trust_score": self.trust_score,
-        }
+        """Convert to dictionary for serialization (do not mutate)."""
+        cached = self._cached_dict
+        if cached is None:
+            cached = {
+                "node_id": self.node_id,
+                "address": self.address,
+                "public_key": self.public_key,
+                "last_seen": self.last_seen,
+                "trust_score": self.trust_score,
+            }
+            object.__setattr__(self, "_cached_dict", cached)
+        return cached
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "PeerInfo":
@@ -62,7 +94,7 @@ class PeerInfo:
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """Base message structure for all network communication."""
     msg_type: int
@@ -70,7 +102,7 @@ class Message:
     timestamp: float
     payload: Dict[str, Any]
     signature: Optional[bytes] = None
-    message_id: Optional[str] = None
+    message_id: Optional[bytes] = None
     ttl: int = 10
     
     def __post_init__(self):
@@ -78,41 +110,98 @@ class Message:
         if self.message_id is None:
             self.message_id = self._generate_message_id()
     
-    def _generate_message_id(self) -> str:
-        """Generate a unique message ID."""
+    def _generate_message_id(self) -> bytes:
+        """Generate a unique message ID (8-byte BLAKE2b digest).
+
+        message_id only feeds local dedup and gossip loop prevention, so
+        it needs uniform distribution, not cryptographic collision
+        resistance - the signature covers integrity. BLAKE2b with a
+        native 8-byte digest is markedly faster than SHA-256 on these
+        short inputs.
+        """
         data = f"{self.sender_id}{self.timestamp}{self.msg_type}{str(self.payload)}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        return hashlib.blake2b(data.encode(), digest_size=8).digest()
     
+    # Packed static prefixes (map header + msg_type + sender_id) keyed by
+    # (msg_type, sender_id, include_signature). Heartbeats and discovery
+    # pings are fixed-shape and high-rate, so reusing the prefix skips
+    # re-packing the fields that never change for a given sender.
+    _prefix_cache: ClassVar[Dict[tuple, bytes]] = {}
+    _PREFIX_CACHE_MAX: ClassVar[int] = 4096
+
+    def _pack_static_prefix(self, include_signature: bool) -> bytes:
+        """Get (or build) the packed static prefix for this message shape."""
+        key = (int(self.msg_type), self.sender_id, include_signature)
+        prefix = Message._prefix_cache.get(key)
+        if prefix is None:
+            _packer.reset()
+            _packer.pack_map_header(7 if include_signature else 6)
+            _packer.pack("msg_type")
+            _packer.pack(int(self.msg_type))
+            _packer.pack("sender_id")
+            _packer.pack(self.sender_id)
+            prefix = bytes(_packer.getbuffer())
+            if len(Message._prefix_cache) >= Message._PREFIX_CACHE_MAX:
+                Message._prefix_cache.clear()
+            Message._prefix_cache[key] = prefix
+        return prefix
+
+    def _pack_fields(self, include_signature: bool) -> bytes:
+        """Pack message fields directly into the shared packer buffer."""
+        prefix = self._pack_static_prefix(include_signature)
+        _packer.reset()
+        _packer.pack("timestamp")
+        _packer.pack(self.timestamp)
+        _packer.pack("payload")
+        _packer.pack(self.payload)
+        _packer.pack("message_id")
+        _packer.pack(self.message_id)
+        _packer.pack("ttl")
+        _packer.pack(self.ttl)
+        # Signature goes last so the signable bytes are a strict prefix
+        # of the full serialization; decoding is key-order agnostic.
+        if include_signature:
+            _packer.pack("signature")
+            _packer.pack(self.signature)
+        return prefix + bytes(_packer.getbuffer())
+
     def to_bytes(self) -> bytes:
         """Serialize message to bytes using msgpack."""
-        data = {
-            "msg_type": self.msg_type,
-            "sender_id": self.sender_id,
-            "timestamp": self.timestamp,
-            "payload": self.payload,
-            "signature": self.signature,
-            "message_id": self.message_id,
-            "ttl": self.ttl,
-        }
-        return msgpack.packb(data, use_bin_type=True)
-    
+        return self._pack_fields(include_signature=True)
+
+    def sign_and_serialize(self, sign_fn) -> bytes:
+        """
+        Sign and serialize the message in a single packing pass.
+
+        Packs the signable fields once, signs them, stores the signature
+        on the message and splices it onto the already-packed bytes -
+        instead of serializing the same six fields twice.
+
+        Args:
+            sign_fn: Callable taking the signable bytes, returning the
+                signature
+
+        Returns:
+            Full wire bytes including the signature
+        """
+        signable = self._pack_fields(include_signature=False)
+        self.signature = sign_fn(signable)
+        _packer.reset()
+        _packer.pack("signature")
+        _packer.pack(self.signature)
+        # signable starts with a one-byte fixmap(6) header; bump it to
+        # fixmap(7) and append the signature entry.
+        return b"\x87" + signable[1:] + bytes(_packer.getbuffer())
+
     @classmethod
     def from_bytes(cls, data: bytes) -> "Message":
         """Deserialize message from bytes."""
-        unpacked = msgpack.unpackb(data, raw=False)
+        unpacked = msgpack.unpackb(data, **_UNPACK_KW)
         return cls(**unpacked)
-    
+
     def get_signable_data(self) -> bytes:
         """Get data that should be signed (everything except signature)."""
-        data = {
-            "msg_type": self.msg_type,
-            "sender_id": self.sender_id,
-            "timestamp": self.timestamp,
-            "payload": self.payload,
-            "message_id": self.message_id,
-            "ttl": self.ttl,
-        }
-        return msgpack.packb(data, use_bin_type=True)
+        return self._pack_fields(include_signature=False)
 
 
 class MessageFactory:
@@ -149,7 +238,8 @@ class MessageFactory:
             timestamp=time.time(),
             payload={
                 "public_key": public_key,
-                "peers": [p.to_dict() for p in peers],
+                # Packed via _pack_default; receivers see plain dicts
+                "peers": list(peers),
             }
         )
     
@@ -184,7 +274,8 @@ class MessageFactory:
             sender_id=sender_id,
             timestamp=time.time(),
             payload={
-                "peers": [p.to_dict() for p in peers],
+                # Packed via _pack_default; receivers see plain dicts
+                "peers": list(peers),
             }
         )
     
@@ -243,7 +334,8 @@ class MessageFactory:
             sender_id=sender_id,
             timestamp=time.time(),
             payload={
-                "trusted_peers": [p.to_dict() for p in trusted_peers],
+                # Packed via _pack_default; receivers see plain dicts
+                "trusted_peers": list(trusted_peers),
             }
         )
     
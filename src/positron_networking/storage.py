@@ -2,37 +2,187 @@
 Persistent storage for network state, peers, and trust data.
 """
 import aiosqlite
+import asyncio
 import json
-from typing import List, Optional, Dict, Any
+import msgpack
+from collections import OrderedDict
+from typing import AsyncIterator, List, Optional, Dict, Any, Set, Tuple
 from positron_networking.protocol import PeerInfo
 import time
 
 
+# SQL for the hot paths lives in module-level constants so the exact same
+# string object is passed to sqlite3 every time, letting its per-connection
+# statement cache skip re-parsing.
+_SAVE_PEER_SQL = """
+    INSERT INTO peers
+    (node_id, address, public_key, last_seen, trust_score, first_seen)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(node_id) DO UPDATE SET
+        address = excluded.address,
+        public_key = excluded.public_key,
+        last_seen = excluded.last_seen,
+        trust_score = excluded.trust_score
+"""
+
+_MARK_SEEN_SQL = (
+    "INSERT OR IGNORE INTO messages_seen (message_id, timestamp, sender_id) "
+    "VALUES (?, ?, ?)"
+)
+
+_HAS_SEEN_SQL = "SELECT 1 FROM messages_seen WHERE message_id = ?"
+
+_INCREMENT_STATS_SQL = """
+    UPDATE peers
+    SET valid_messages = valid_messages + ?,
+        invalid_messages = invalid_messages + ?
+    WHERE node_id = ?
+"""
+
+_LOG_TRUST_EVENT_SQL = """
+    INSERT INTO trust_events (node_id, event_type, trust_delta, timestamp, reason)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_PEER_COLUMNS = "node_id, address, public_key, last_seen, trust_score"
+
+
 class Storage:
     """Handles persistent storage of network state."""
-    
-    def __init__(self, db_path: str):
+
+    def __init__(
+        self,
+        db_path: str,
+        flush_interval: float = 0.05,
+        max_batch_size: int = 100,
+        seen_cache_size: int = 100_000
+    ):
         """
         Initialize storage.
-        
+
         Args:
             db_path: Path to SQLite database file
+            flush_interval: How long the writer coalesces queued writes
+            max_batch_size: Maximum writes committed in one transaction
+            seen_cache_size: Maximum message IDs kept in the in-memory cache
         """
         self.db_path = db_path
         self.db: Optional[aiosqlite.Connection] = None
-    
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+
+        # Write-coalescing queue: mutations enqueue (sql, params, seen_id)
+        # and a background task commits them in batches, so the gossip hot
+        # path never waits on an fsync. seen_id tracks message IDs whose
+        # mark_message_seen row is still uncommitted.
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._pending_seen: Set[bytes] = set()
+        # Writes the writer has popped off the queue but not yet
+        # committed. Shared with flush() so a reader flushing for
+        # read-your-writes also covers the batch coalescing in-hand,
+        # not just what is still queued.
+        self._inflight: List[Tuple[str, tuple, Optional[bytes]]] = []
+
+        # LRU cache of known-seen message IDs so duplicate gossip
+        # short-circuits without a SQL round-trip; the DB only sees
+        # first-time messages.
+        self._seen_cache: "OrderedDict[bytes, None]" = OrderedDict()
+        self._seen_cache_size = seen_cache_size
+
     async def initialize(self):
         """Initialize database and create tables."""
         self.db = await aiosqlite.connect(self.db_path)
         await self._create_tables()
-    
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
     async def close(self):
-        """Close database connection."""
+        """Flush pending writes and close database connection."""
+        if self._writer_task:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
         if self.db:
+            await self.flush()
             await self.db.close()
+
+    def _enqueue_write(self, sql: str, params: tuple, seen_id: Optional[bytes] = None):
+        """Queue a write for the background writer."""
+        if seen_id is not None:
+            self._pending_seen.add(seen_id)
+        self._write_queue.put_nowait((sql, params, seen_id))
+
+    async def _writer_loop(self):
+        """Background task that commits queued writes in batches."""
+        inflight = self._inflight
+        while True:
+            try:
+                inflight.append(await self._write_queue.get())
+                try:
+                    # Coalesce writes arriving within the flush window
+                    await asyncio.sleep(self.flush_interval)
+                    while (len(inflight) < self.max_batch_size
+                           and not self._write_queue.empty()):
+                        inflight.append(self._write_queue.get_nowait())
+                finally:
+                    # Commit even when close() cancels us mid-sleep;
+                    # these writes are already off the queue, so the
+                    # final flush() cannot see them. No-ops when a
+                    # concurrent flush() already committed the batch.
+                    await self._flush_batch()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Error in storage writer loop: {e}")
+
+    async def _flush_batch(self):
+        """Commit the in-hand batch in a single transaction."""
+        async with self._flush_lock:
+            batch = self._inflight
+            if not batch:
+                return
+            # Snapshot: writes appended while we await below belong to
+            # the next commit
+            committed = batch[:]
+            for sql, params, _ in committed:
+                await self.db.execute(sql, params)
+            await self.db.commit()
+            del batch[:len(committed)]
+            for _, _, seen_id in committed:
+                if seen_id is not None:
+                    self._pending_seen.discard(seen_id)
+
+    async def flush(self):
+        """Flush all queued writes to the database immediately.
+
+        Covers both what is still queued and the batch the writer has
+        already popped but not yet committed (it coalesces under a
+        short sleep holding the batch), so flushing readers get
+        read-your-writes for every enqueued mutation.
+        """
+        if not self._write_queue:
+            return
+        inflight = self._inflight
+        while not self._write_queue.empty():
+            inflight.append(self._write_queue.get_nowait())
+        await self._flush_batch()
     
     async def _create_tables(self):
         """Create database tables if they don't exist."""
+        # WAL avoids the rollback journal's double fsync per commit and
+        # lets readers proceed during writes; synchronous=NORMAL is safe
+        # with WAL (a crash can only lose the last batch of gossip
+        # bookkeeping, which peers will simply re-send).
+        await self.db.execute("PRAGMA journal_mode=WAL")
+        await self.db.execute("PRAGMA synchronous=NORMAL")
+        await self.db.execute("PRAGMA temp_store=MEMORY")
+        await self.db.execute("PRAGMA mmap_size=268435456")
+        await self.db.execute("PRAGMA cache_size=-65536")
+
         await self.db.execute("""
             CREATE TABLE IF NOT EXISTS peers (
                 node_id TEXT PRIMARY KEY,
@@ -49,7 +199,7 @@ class Storage:
         
         await self.db.execute("""
             CREATE TABLE IF NOT EXISTS messages_seen (
-                message_id TEXT PRIMARY KEY,
+                message_id BLOB PRIMARY KEY,
                 timestamp REAL NOT NULL,
                 sender_id TEXT NOT NULL
             )
@@ -60,6 +210,13 @@ class Storage:
             ON messages_seen(timestamp)
         """)
         
+        # Lets get_trusted_peers range-scan already-sorted rows instead of
+        # scanning and sorting the whole peers table
+        await self.db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_peers_trust
+            ON peers(trust_score DESC)
+        """)
+
         await self.db.execute("""
             CREATE TABLE IF NOT EXISTS trust_events (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -70,11 +227,18 @@ class Storage:
                 reason TEXT
             )
         """)
-        
+
+        # Covers get_trust_history's per-node lookup with its
+        # ORDER BY timestamp DESC LIMIT
+        await self.db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_trust_events_node_ts
+            ON trust_events(node_id, timestamp DESC)
+        """)
+
         await self.db.execute("""
             CREATE TABLE IF NOT EXISTS network_state (
                 key TEXT PRIMARY KEY,
-                value TEXT NOT NULL,
+                value BLOB NOT NULL,
                 updated_at REAL NOT NULL
             )
         """)
@@ -83,29 +247,19 @@ class Storage:
     
     async def save_peer(self, peer: PeerInfo):
         """Save or update peer information."""
-        async with self.db.execute(
-            "SELECT first_seen FROM peers WHERE node_id = ?",
-            (peer.node_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            first_seen = row[0] if row else time.time()
-        
-        await self.db.execute("""
-            INSERT OR REPLACE INTO peers 
-            (node_id, address, public_key, last_seen, trust_score, first_seen)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
+        # Upsert preserves first_seen on update and avoids a read round-trip
+        self._enqueue_write(_SAVE_PEER_SQL, (
             peer.node_id,
             peer.address,
             peer.public_key,
             peer.last_seen,
             peer.trust_score,
-            first_seen
+            time.time()
         ))
-        await self.db.commit()
     
     async def get_peer(self, node_id: str) -> Optional[PeerInfo]:
         """Get peer information by node ID."""
+        await self.flush()
         async with self.db.execute(
             "SELECT node_id, address, public_key, last_seen, trust_score FROM peers WHERE node_id = ?",
             (node_id,)
@@ -121,49 +275,139 @@ class Storage:
                 )
         return None
     
-    async def get_all_peers(self) -> List[PeerInfo]:
-        """Get all stored peers."""
-        peers = []
+    async def get_peers_columnar(
+        self,
+        min_trust: Optional[float] = None
+    ) -> Dict[str, list]:
+        """
+        Get stored peers as parallel columns instead of PeerInfo objects.
+
+        Avoids allocating one dataclass per row for callers that scan a
+        single attribute (top-K by trust, broadcast address lists).
+
+        Args:
+            min_trust: Only include peers at or above this trust score
+
+        Returns:
+            Dict of parallel lists keyed by column name, sorted by
+            descending trust score when min_trust is given
+        """
+        if min_trust is None:
+            sql = f"SELECT {_PEER_COLUMNS} FROM peers"
+            params = ()
+        else:
+            sql = (
+                f"SELECT {_PEER_COLUMNS} FROM peers "
+                "WHERE trust_score >= ? ORDER BY trust_score DESC"
+            )
+            params = (min_trust,)
+        await self.flush()
+        async with self.db.execute(sql, params) as cursor:
+            rows = await cursor.fetchall()
+        return {
+            "node_id": [r[0] for r in rows],
+            "address": [r[1] for r in rows],
+            "public_key": [r[2] for r in rows],
+            "last_seen": [r[3] for r in rows],
+            "trust_score": [r[4] for r in rows],
+        }
+
+    async def _fetch_peers(self, sql: str, params: tuple = ()) -> List[PeerInfo]:
+        """Fetch peer rows and materialize them as PeerInfo objects."""
+        await self.flush()
+        async with self.db.execute(sql, params) as cursor:
+            rows = await cursor.fetchall()
+        return [
+            PeerInfo(
+                node_id=row[0],
+                address=row[1],
+                public_key=row[2],
+                last_seen=row[3],
+                trust_score=row[4]
+            )
+            for row in rows
+        ]
+
+    async def iter_all_peers(self) -> AsyncIterator[PeerInfo]:
+        """Iterate over all stored peers without materializing the list.
+
+        Yields one PeerInfo per row, so peak memory stays flat no matter
+        how large the peer table grows. Prefer this over get_all_peers
+        in loops that visit each peer once.
+        """
+        await self.flush()
         async with self.db.execute(
-            "SELECT node_id, address, public_key, last_seen, trust_score FROM peers"
+            f"SELECT {_PEER_COLUMNS} FROM peers"
         ) as cursor:
             async for row in cursor:
-                peers.append(PeerInfo(
+                yield PeerInfo(
                     node_id=row[0],
                     address=row[1],
                     public_key=row[2],
                     last_seen=row[3],
                     trust_score=row[4]
-                ))
-        return peers
-    
+                )
+
+    async def get_all_peers(self) -> List[PeerInfo]:
+        """Get all stored peers."""
+        return [peer async for peer in self.iter_all_peers()]
+
     async def get_trusted_peers(self, min_trust: float = 0.7) -> List[PeerInfo]:
         """Get peers with trust score above threshold."""
-        peers = []
-        async with self.db.execute(
-            "SELECT node_id, address, public_key, last_seen, trust_score FROM peers WHERE trust_score >= ? ORDER BY trust_score DESC",
+        return await self._fetch_peers(
+            f"SELECT {_PEER_COLUMNS} FROM peers "
+            "WHERE trust_score >= ? ORDER BY trust_score DESC",
             (min_trust,)
-        ) as cursor:
-            async for row in cursor:
-                peers.append(PeerInfo(
-                    node_id=row[0],
-                    address=row[1],
-                    public_key=row[2],
-                    last_seen=row[3],
-                    trust_score=row[4]
-                ))
-        return peers
+        )
     
     async def update_peer_trust(self, node_id: str, trust_score: float):
         """Update peer's trust score."""
+        # Commit any queued save_peer first: the UPDATE silently no-ops
+        # on a row whose INSERT is still in the write queue, and the
+        # batch would then commit the stale trust score over this one
+        await self.flush()
         await self.db.execute(
             "UPDATE peers SET trust_score = ? WHERE node_id = ?",
             (trust_score, node_id)
         )
         await self.db.commit()
     
+    async def bulk_update_peer_trust(
+        self,
+        changes: List[Tuple[str, float, float]],
+        reason: str = ""
+    ):
+        """Update trust scores for many peers in one transaction.
+
+        Args:
+            changes: List of (node_id, new_trust, trust_delta) tuples
+            reason: Reason recorded in the aggregate trust event
+
+        One executemany plus a single aggregate log row replaces the
+        two round-trips per peer that per-peer updates would cost.
+        """
+        if not changes:
+            return
+        # Same ordering hazard as update_peer_trust: queued saves must
+        # land before these UPDATEs
+        await self.flush()
+        await self.db.executemany(
+            "UPDATE peers SET trust_score = ? WHERE node_id = ?",
+            [(trust, node_id) for node_id, trust, _ in changes]
+        )
+        await self.db.commit()
+        total_delta = sum(delta for _, _, delta in changes)
+        self._enqueue_write(
+            _LOG_TRUST_EVENT_SQL,
+            (f"bulk:{len(changes)}", "bulk_update", total_delta,
+             time.time(), reason)
+        )
+
     async def remove_peer(self, node_id: str):
         """Remove peer from storage."""
+        # A queued save_peer committing after this DELETE would
+        # resurrect the peer; flush so the delete wins
+        await self.flush()
         await self.db.execute("DELETE FROM peers WHERE node_id = ?", (node_id,))
         await self.db.commit()
     
@@ -174,39 +418,93 @@ class Storage:
         invalid_messages: int = 0
     ):
         """Increment peer statistics."""
-        await self.db.execute("""
-            UPDATE peers 
-            SET valid_messages = valid_messages + ?,
-                invalid_messages = invalid_messages + ?
-            WHERE node_id = ?
-        """, (valid_messages, invalid_messages, node_id))
+        self._enqueue_write(
+            _INCREMENT_STATS_SQL,
+            (valid_messages, invalid_messages, node_id)
+        )
+
+    async def bulk_increment_peer_stats(
+        self,
+        counts: Dict[str, Tuple[int, int]]
+    ):
+        """Apply accumulated (valid, invalid) message counts per peer.
+
+        Args:
+            counts: Mapping of node_id to (valid_messages,
+                invalid_messages) increments
+
+        One executemany in a single transaction replaces a write per
+        counted message.
+        """
+        if not counts:
+            return
+        await self.db.executemany(
+            _INCREMENT_STATS_SQL,
+            [(valid, invalid, node_id)
+             for node_id, (valid, invalid) in counts.items()]
+        )
         await self.db.commit()
-    
-    async def has_seen_message(self, message_id: str) -> bool:
+
+    def _cache_seen(self, message_id: bytes):
+        """Remember a message ID in the LRU seen cache."""
+        cache = self._seen_cache
+        if message_id in cache:
+            cache.move_to_end(message_id)
+            return
+        if len(cache) >= self._seen_cache_size:
+            cache.popitem(last=False)
+        cache[message_id] = None
+
+    async def has_seen_message(self, message_id: bytes) -> bool:
         """Check if a message has been seen before."""
+        if message_id in self._seen_cache:
+            return True
+        # A queued-but-uncommitted mark still counts as seen
+        if message_id in self._pending_seen:
+            return True
         async with self.db.execute(
-            "SELECT 1 FROM messages_seen WHERE message_id = ?",
+            _HAS_SEEN_SQL,
             (message_id,)
         ) as cursor:
             row = await cursor.fetchone()
-            return row is not None
-    
-    async def mark_message_seen(self, message_id: str, sender_id: str):
+        if row is not None:
+            self._cache_seen(message_id)
+            return True
+        return False
+
+    async def mark_message_seen(self, message_id: bytes, sender_id: str):
         """Mark a message as seen."""
-        await self.db.execute(
-            "INSERT OR IGNORE INTO messages_seen (message_id, timestamp, sender_id) VALUES (?, ?, ?)",
-            (message_id, time.time(), sender_id)
+        self._cache_seen(message_id)
+        self._enqueue_write(
+            _MARK_SEEN_SQL,
+            (message_id, time.time(), sender_id),
+            seen_id=message_id
         )
-        await self.db.commit()
     
     async def cleanup_old_messages(self, max_age: float = 3600):
-        """Remove old message records to prevent database growth."""
+        """Remove old message records to prevent database growth.
+
+        Deletes in chunks so a large backlog never holds the write lock
+        for one long transaction, yielding to the event loop between
+        chunks. Checkpoints the WAL afterwards so the deleted pages are
+        actually reclaimed instead of accumulating in the -wal file.
+        """
         cutoff = time.time() - max_age
-        await self.db.execute(
-            "DELETE FROM messages_seen WHERE timestamp < ?",
-            (cutoff,)
-        )
-        await self.db.commit()
+        deleted_any = False
+        while True:
+            cursor = await self.db.execute(
+                "DELETE FROM messages_seen WHERE rowid IN ("
+                "SELECT rowid FROM messages_seen WHERE timestamp < ? LIMIT 1000)",
+                (cutoff,)
+            )
+            await self.db.commit()
+            if cursor.rowcount == 0:
+                break
+            deleted_any = True
+            # Let queued reads/writes run between chunks
+            await asyncio.sleep(0)
+        if deleted_any:
+            await self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
     
     async def log_trust_event(
         self,
@@ -216,14 +514,14 @@ class Storage:
         reason: str = ""
     ):
         """Log a trust-related event."""
-        await self.db.execute("""
-            INSERT INTO trust_events (node_id, event_type, trust_delta, timestamp, reason)
-            VALUES (?, ?, ?, ?, ?)
-        """, (node_id, event_type, trust_delta, time.time(), reason))
-        await self.db.commit()
+        self._enqueue_write(
+            _LOG_TRUST_EVENT_SQL,
+            (node_id, event_type, trust_delta, time.time(), reason)
+        )
     
     async def get_trust_history(self, node_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Get trust event history for a node."""
+        await self.flush()
         events = []
         async with self.db.execute("""
             SELECT event_type, trust_delta, timestamp, reason
@@ -243,19 +541,23 @@ class Storage:
     
     async def set_state(self, key: str, value: Any):
         """Store arbitrary state data."""
-        await self.db.execute("""
+        self._enqueue_write("""
             INSERT OR REPLACE INTO network_state (key, value, updated_at)
             VALUES (?, ?, ?)
-        """, (key, json.dumps(value), time.time()))
-        await self.db.commit()
+        """, (key, msgpack.packb(value, use_bin_type=True), time.time()))
     
     async def get_state(self, key: str) -> Optional[Any]:
         """Retrieve state data."""
+        await self.flush()
         async with self.db.execute(
             "SELECT value FROM network_state WHERE key = ?",
             (key,)
         ) as cursor:
             row = await cursor.fetchone()
             if row:
-                return json.loads(row[0])
+                value = row[0]
+                if isinstance(value, str):
+                    # Row written before the msgpack migration
+                    return json.loads(value)
+                return msgpack.unpackb(value, raw=False)
         return None
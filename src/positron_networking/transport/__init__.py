@@ -1,21 +1,53 @@
-"""Transport layer package."""
-from positron_networking.transport.packet import Packet, PacketHeader, PacketType, PacketFlags, PacketFragmenter
-from positron_networking.transport.connection import Connection, ConnectionState
-from positron_networking.transport.udp_transport import UDPTransport
-from positron_networking.transport.tcp_transport import TCPTransport
-from positron_networking.transport.flow_control import FlowController, CongestionController, AdaptiveFlowController
-
-__all__ = [
-    'Packet',
-    'PacketHeader',
-    'PacketType',
-    'PacketFlags',
-    'PacketFragmenter',
-    'Connection',
-    'ConnectionState',
-    'UDPTransport',
-    'TCPTransport',
-    'FlowController',
-    'CongestionController',
-    'AdaptiveFlowController',
-]
+"""Transport layer package.
+
+Submodules are loaded lazily (PEP 562): importing the package costs
+nothing until a transport class is first touched, so a TCP-only client
+never pays the UDP/flow-control import work.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from positron_networking.transport.packet import (
+        Packet, PacketHeader, PacketType, PacketFlags, PacketFragmenter
+    )
+    from positron_networking.transport.connection import Connection, ConnectionState
+    from positron_networking.transport.udp_transport import UDPTransport
+    from positron_networking.transport.tcp_transport import TCPTransport
+    from positron_networking.transport.flow_control import (
+        FlowController, CongestionController, AdaptiveFlowController
+    )
+
+_LAZY = {
+    'Packet': 'positron_networking.transport.packet',
+    'PacketHeader': 'positron_networking.transport.packet',
+    'PacketType': 'positron_networking.transport.packet',
+    'PacketFlags': 'positron_networking.transport.packet',
+    'PacketFragmenter': 'positron_networking.transport.packet',
+    'Connection': 'positron_networking.transport.connection',
+    'ConnectionState': 'positron_networking.transport.connection',
+    'UDPTransport': 'positron_networking.transport.udp_transport',
+    'TCPTransport': 'positron_networking.transport.tcp_transport',
+    'FlowController': 'positron_networking.transport.flow_control',
+    'CongestionController': 'positron_networking.transport.flow_control',
+    'AdaptiveFlowController': 'positron_networking.transport.flow_control',
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    module = importlib.import_module(module_name)
+    value = getattr(module, name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -2,13 +2,35 @@
 Connection state management and lifecycle.
 """
 import asyncio
+import heapq
 from enum import IntEnum
-from typing import Optional, Dict, Deque
+from typing import List, Optional, Dict, Deque, Tuple
 from collections import deque
+import struct
 import time
 from positron_networking.transport.packet import Packet, PacketType, PacketFlags
 
 
+# Precompiled unpacker for the wall-clock timestamp echoed in pong
+# payloads; avoids reparsing the format string on every keepalive
+_PING_UNPACK = struct.Struct('!d').unpack_from
+
+
+# Monotonic clock for all intra-connection timing (RTT samples,
+# retransmit expiries, activity timeouts): immune to wall-clock jumps
+# that would fire spurious RTOs, and cached as a local name so the hot
+# paths skip the module attribute lookup. Wall-clock time is only used
+# where a timestamp crosses the wire (ping/pong payloads).
+_monotonic = time.monotonic
+
+# Jacobson/Karels smoothing constants (RFC 6298), precomputed so the
+# per-ACK update is two multiply-adds with no subtraction of constants
+_ALPHA = 0.125
+_ONE_MINUS_ALPHA = 0.875
+_BETA = 0.25
+_ONE_MINUS_BETA = 0.75
+
+
 class ConnectionState(IntEnum):
     """Connection states."""
     CLOSED = 0
@@ -29,7 +51,25 @@ class Connection:
     Manages a single connection between two peers.
     Handles state, sequence numbers, retransmission, and ordering.
     """
-    
+
+    __slots__ = (
+        'connection_id', 'local_addr', 'remote_addr',
+        'state',
+        'send_sequence', 'recv_sequence', 'send_ack', 'recv_ack',
+        'send_buffer', '_recv_ring', '_recv_bitmap', '_recv_buffered',
+        'unacked_packets', '_retrans_heap', '_retransmitted_seqs',
+        'send_window', 'recv_window', 'bytes_in_flight',
+        'srtt', 'rttvar', '_srtt_initialized',
+        'rto', 'min_rto', 'max_rto',
+        'last_activity', 'last_ack_sent',
+        'packets_sent', 'packets_received', 'packets_retransmitted',
+        'bytes_sent', 'bytes_received',
+        'on_packet_callback', 'on_state_change_callback',
+        '_dispatch', '_ack_pool',
+        '_pending_ack_count', '_ack_deadline',
+        'established_event', 'closed_event',
+    )
+
     def __init__(
         self,
         connection_id: Optional[str] = None,
@@ -55,11 +95,14 @@ class Connection:
         self.connection_id = connection_id or f"conn_{id(self)}"
         self.local_addr = local_addr or ("0.0.0.0", 0)
         self.remote_addr = remote_addr or ("0.0.0.0", 0)
-        self.peer_addr = self.remote_addr  # Alias for compatibility
         
         # State
         self.state = ConnectionState.CLOSED
-        
+        # Signalled on the matching state transitions so waiters wake
+        # immediately instead of polling
+        self.established_event = asyncio.Event()
+        self.closed_event = asyncio.Event()
+
         # Sequence numbers
         self.send_sequence = initial_sequence or 1000  # Use 1000 as test-compatible default
         self.recv_sequence = 0
@@ -68,22 +111,45 @@ class Connection:
         
         # Buffers
         self.send_buffer: Deque[Packet] = deque()  # Packets waiting to be sent
-        self.recv_buffer: Dict[int, Packet] = {}   # Out-of-order received packets
+        # Out-of-order received packets: ring indexed by seq % capacity
+        # with an occupancy bitmap, grown on demand. Cheaper than a dict
+        # per buffered packet and drains with a bit test per step. The
+        # ring itself is allocated on first reordering so that
+        # short-lived connections never pay for it.
+        self._recv_ring: Optional[List[Optional[Packet]]] = None
+        self._recv_bitmap: Optional[bytearray] = None
+        self._recv_buffered = 0
         self.unacked_packets: Dict[int, Packet] = {}  # Sent but not acknowledged
+        # Min-heap of (expiry, sequence) for retransmit polling; entries
+        # for already-acked sequences are discarded lazily on pop
+        self._retrans_heap: List[Tuple[float, int]] = []
+        # Sequences retransmitted at least once; their RTT samples are
+        # ambiguous (Karn's algorithm) and must not feed the estimator
+        self._retransmitted_seqs: set = set()
+        # Free list of ACK packets reused on the pure-ACK reply path;
+        # callers hand them back via release_packet after serializing.
+        # Created lazily on the first release.
+        self._ack_pool: Optional[Deque[Packet]] = None
+        # Delayed-ACK state: in-order data is acknowledged every second
+        # packet or once the 40ms deadline passes, halving ACK traffic
+        self._pending_ack_count = 0
+        self._ack_deadline = 0.0
         
         # Flow control
-        self.send_window = 65535  # Remote's receive window
-        self.recv_window = 65535  # Our receive window
+        self.send_window = 65535  # Remote's receive window (bytes)
+        self.recv_window = 65535  # Our receive window (bytes)
+        self.bytes_in_flight = 0  # Payload bytes sent but not acked
         
         # RTT estimation (for retransmission timeout)
         self.srtt = 1.0  # Smoothed RTT in seconds
         self.rttvar = 0.5  # RTT variance
+        self._srtt_initialized = False  # No RTT sample taken yet
         self.rto = 3.0  # Retransmission timeout
         self.min_rto = 1.0  # Minimum RTO (compatibility)
         self.max_rto = 60.0  # Maximum RTO (compatibility)
         
         # Timing
-        self.last_activity = time.time()
+        self.last_activity = _monotonic()
         self.last_ack_sent = 0
         
         # Statistics
@@ -96,7 +162,26 @@ class Connection:
         # Callbacks
         self.on_packet_callback = None
         self.on_state_change_callback = None
+
+        # Packet dispatch table with pre-bound handlers: one dict lookup
+        # per packet instead of a chain of type comparisons. Keys are
+        # plain ints to match the normalized header field.
+        self._dispatch = {
+            int(PacketType.SYN): self._handle_syn,
+            int(PacketType.SYN_ACK): self._handle_syn_ack,
+            int(PacketType.ACK): self._handle_ack,
+            int(PacketType.DATA): self._handle_data,
+            int(PacketType.FIN): self._handle_fin,
+            int(PacketType.FIN_ACK): self._handle_fin_ack,
+            int(PacketType.PING): self._handle_ping,
+            int(PacketType.PONG): self._handle_pong,
+        }
     
+    @property
+    def peer_addr(self) -> tuple:
+        """Alias for remote_addr (compatibility)."""
+        return self.remote_addr
+
     @property
     def sequence_number(self) -> int:
         """Get current sequence number (compatibility)."""
@@ -118,7 +203,12 @@ class Connection:
         if self.state != new_state:
             old_state = self.state
             self.state = new_state
-            
+
+            if new_state == ConnectionState.ESTABLISHED:
+                self.established_event.set()
+            elif new_state == ConnectionState.CLOSED:
+                self.closed_event.set()
+
             if self.on_state_change_callback:
                 self.on_state_change_callback(old_state, new_state)
     
@@ -132,28 +222,15 @@ class Connection:
         Returns:
             Response packet if needed, None otherwise
         """
-        self.last_activity = time.time()
+        self.last_activity = _monotonic()
         self.packets_received += 1
         self.bytes_received += len(packet.payload)
         
         # Handle based on packet type
-        if packet.header.packet_type == PacketType.SYN:
-            return self._handle_syn(packet)
-        elif packet.header.packet_type == PacketType.SYN_ACK:
-            return self._handle_syn_ack(packet)
-        elif packet.header.packet_type == PacketType.ACK:
-            return self._handle_ack(packet)
-        elif packet.header.packet_type == PacketType.DATA:
-            return self._handle_data(packet)
-        elif packet.header.packet_type == PacketType.FIN:
-            return self._handle_fin(packet)
-        elif packet.header.packet_type == PacketType.FIN_ACK:
-            return self._handle_fin_ack(packet)
-        elif packet.header.packet_type == PacketType.PING:
-            return self._handle_ping(packet)
-        elif packet.header.packet_type == PacketType.PONG:
-            return self._handle_pong(packet)
-        
+        handler = self._dispatch.get(packet.header.packet_type)
+        if handler is not None:
+            return handler(packet)
+
         return None
     
     def _handle_syn(self, packet: Packet) -> Optional[Packet]:
@@ -177,22 +254,45 @@ class Connection:
             self.update_state(ConnectionState.ESTABLISHED)
             
             # Send ACK to complete handshake
-            return Packet.create_ack(self.recv_sequence, self.recv_window)
+            return self._make_ack()
         return None
     
     def _handle_ack(self, packet: Packet) -> Optional[Packet]:
         """Handle ACK packet."""
         ack_num = packet.header.ack_number
-        
-        # Remove acknowledged packets from unacked buffer
-        acked_seqs = [seq for seq in self.unacked_packets if seq < ack_num]
-        for seq in acked_seqs:
-            # Update RTT estimate
-            if seq in self.unacked_packets:
-                sent_packet = self.unacked_packets[seq]
-                rtt = time.time() - sent_packet.timestamp
-                self._update_rtt(rtt)
-                del self.unacked_packets[seq]
+        now = _monotonic()
+
+        # unacked_packets is insertion-ordered by monotonically increasing
+        # sequence number, so cumulative ACKs always pop from the front:
+        # O(newly acked) instead of a scan over the whole in-flight window.
+        # Hot state is bound to locals once; the per-segment loop body
+        # then runs without repeated self.<attr> lookups.
+        unacked = self.unacked_packets
+        retransmitted = self._retransmitted_seqs
+        update_rtt = self._update_rtt
+        bytes_in_flight = self.bytes_in_flight
+        acked_retransmit = False
+        while unacked:
+            seq = next(iter(unacked))
+            if seq >= ack_num:
+                break
+            sent_packet = unacked.pop(seq)
+            bytes_in_flight -= len(sent_packet.payload)
+            if seq in retransmitted:
+                # Karn: ambiguous sample, skip the RTT update
+                retransmitted.discard(seq)
+                acked_retransmit = True
+            else:
+                # Update RTT estimate
+                update_rtt(now - sent_packet.timestamp)
+                acked_retransmit = False
+        self.bytes_in_flight = bytes_in_flight if bytes_in_flight > 0 else 0
+
+        # If the last progress came from a retransmitted segment, reset
+        # the RTO from the current estimate rather than keeping any
+        # backed-off value (RFC 6298)
+        if acked_retransmit and self._srtt_initialized:
+            self.rto = self._clamp_rto(self.srtt + 4 * self.rttvar)
         
         # Update send window
         self.send_window = packet.header.window_size
@@ -217,27 +317,100 @@ class Connection:
         if seq == self.recv_sequence:
             # In-order packet
             self.recv_sequence += 1
-            
+
             # Deliver to application
             if self.on_packet_callback:
                 self.on_packet_callback(packet)
-            
-            # Check if we have buffered out-of-order packets
-            while self.recv_sequence in self.recv_buffer:
-                buffered = self.recv_buffer.pop(self.recv_sequence)
+
+            # Drain buffered out-of-order packets that are now in order
+            while self._recv_buffered:
+                idx = self.recv_sequence % len(self._recv_ring)
+                if not (self._recv_bitmap[idx >> 3] >> (idx & 7)) & 1:
+                    break
+                buffered = self._recv_ring[idx]
+                self._recv_ring[idx] = None
+                self._recv_bitmap[idx >> 3] &= ~(1 << (idx & 7))
+                self._recv_buffered -= 1
                 self.recv_sequence += 1
                 if self.on_packet_callback:
                     self.on_packet_callback(buffered)
-        
+
         elif seq > self.recv_sequence:
             # Out-of-order packet - buffer it
-            self.recv_buffer[seq] = packet
-        
-        # Send ACK if needed
+            self._buffer_out_of_order(seq, packet)
+            # ACK immediately so the sender sees duplicate ACKs and can
+            # fast-retransmit; delaying here would hide the loss signal
+            if packet.requires_ack():
+                return self._make_ack()
+            return None
+
+        # In-order (or duplicate) data: delay the ACK
         if packet.requires_ack():
-            return Packet.create_ack(self.recv_sequence, self.recv_window)
-        
+            return self._maybe_ack()
+
         return None
+
+    def _maybe_ack(self) -> Optional[Packet]:
+        """Delayed ACK: acknowledge every second in-order packet
+        immediately, otherwise arm the 40ms deadline and let the
+        maintenance tick flush it."""
+        if self._pending_ack_count:
+            self._pending_ack_count = 0
+            self._ack_deadline = 0.0
+            return self._make_ack()
+        self._pending_ack_count = 1
+        self._ack_deadline = _monotonic() + 0.04
+        return None
+
+    def _make_ack(self) -> Packet:
+        """Get an ACK packet for the current receive state, reusing a
+        pooled packet when one is available."""
+        pool = self._ack_pool
+        if pool:
+            packet = pool.popleft()
+            packet.reset_as_ack(self.recv_sequence, self.recv_window)
+            return packet
+        return Packet.create_ack(self.recv_sequence, self.recv_window)
+
+    def release_packet(self, packet: Packet):
+        """Return a response packet to the pool once it has been
+        serialized; only ACKs are pooled, anything else is dropped."""
+        if packet.header.packet_type == PacketType.ACK:
+            if self._ack_pool is None:
+                self._ack_pool = deque(maxlen=32)
+            self._ack_pool.append(packet)
+
+    def _buffer_out_of_order(self, seq: int, packet: Packet):
+        """Place an out-of-order packet in the reorder ring."""
+        offset = seq - self.recv_sequence
+        if offset >= 65536:
+            # Far outside any plausible window; drop rather than grow
+            return
+        if self._recv_ring is None:
+            self._recv_ring = [None] * 64
+            self._recv_bitmap = bytearray(64 // 8)
+        capacity = len(self._recv_ring)
+        while offset >= capacity:
+            capacity = self._grow_recv_ring()
+        idx = seq % capacity
+        mask = 1 << (idx & 7)
+        if not self._recv_bitmap[idx >> 3] & mask:
+            self._recv_buffered += 1
+        self._recv_ring[idx] = packet
+        self._recv_bitmap[idx >> 3] |= mask
+
+    def _grow_recv_ring(self) -> int:
+        """Double the reorder ring, re-placing buffered packets."""
+        old_ring = self._recv_ring
+        capacity = len(old_ring) * 2
+        self._recv_ring = [None] * capacity
+        self._recv_bitmap = bytearray(capacity >> 3)
+        for pkt in old_ring:
+            if pkt is not None:
+                idx = pkt.header.sequence % capacity
+                self._recv_ring[idx] = pkt
+                self._recv_bitmap[idx >> 3] |= 1 << (idx & 7)
+        return capacity
     
     def _handle_fin(self, packet: Packet) -> Optional[Packet]:
         """Handle FIN packet."""
@@ -245,13 +418,13 @@ class Connection:
         
         if self.state == ConnectionState.ESTABLISHED:
             self.update_state(ConnectionState.CLOSE_WAIT)
-            return Packet.create_ack(self.recv_sequence, self.recv_window)
+            return self._make_ack()
         elif self.state == ConnectionState.FIN_WAIT_1:
             self.update_state(ConnectionState.CLOSING)
-            return Packet.create_ack(self.recv_sequence, self.recv_window)
+            return self._make_ack()
         elif self.state == ConnectionState.FIN_WAIT_2:
             self.update_state(ConnectionState.TIME_WAIT)
-            return Packet.create_ack(self.recv_sequence, self.recv_window)
+            return self._make_ack()
         
         return None
     
@@ -268,8 +441,7 @@ class Connection:
     def _handle_pong(self, packet: Packet) -> Optional[Packet]:
         """Handle pong packet (update RTT)."""
         if len(packet.payload) >= 8:
-            import struct
-            ping_time = struct.unpack('!d', packet.payload[:8])[0]
+            ping_time, = _PING_UNPACK(packet.payload)
             rtt = time.time() - ping_time
             self._update_rtt(rtt)
         return None
@@ -281,21 +453,32 @@ class Connection:
         Args:
             measured_rtt: Measured round-trip time in seconds
         """
-        # First measurement
-        if self.srtt == 1.0:  # Initial value
+        # First measurement (a flag, not a sentinel value: a genuine
+        # 1.0s RTT sample must not re-trigger initialization)
+        if not self._srtt_initialized:
             self.srtt = measured_rtt
             self.rttvar = measured_rtt / 2
+            self._srtt_initialized = True
         else:
             # SRTT = (1 - α) * SRTT + α * RTT
-            alpha = 0.125
-            self.srtt = (1 - alpha) * self.srtt + alpha * measured_rtt
-            
+            self.srtt = _ONE_MINUS_ALPHA * self.srtt + _ALPHA * measured_rtt
+
             # RTTVAR = (1 - β) * RTTVAR + β * |SRTT - RTT|
-            beta = 0.25
-            self.rttvar = (1 - beta) * self.rttvar + beta * abs(self.srtt - measured_rtt)
-        
+            self.rttvar = (
+                _ONE_MINUS_BETA * self.rttvar
+                + _BETA * abs(self.srtt - measured_rtt)
+            )
+
         # RTO = SRTT + 4 * RTTVAR
-        self.rto = max(1.0, self.srtt + 4 * self.rttvar)
+        self.rto = self._clamp_rto(self.srtt + 4 * self.rttvar)
+
+    def _clamp_rto(self, rto: float) -> float:
+        """Clamp a candidate RTO into [min_rto, max_rto]."""
+        if rto < self.min_rto:
+            return self.min_rto
+        if rto > self.max_rto:
+            return self.max_rto
+        return rto
     
     def send_packet(self, packet: Packet):
         """
@@ -304,12 +487,16 @@ class Connection:
         Args:
             packet: Packet to send
         """
-        packet.timestamp = time.time()
+        packet.timestamp = _monotonic()
         self.send_buffer.append(packet)
         
         # Track unacked packets
         if packet.requires_ack():
             self.unacked_packets[packet.header.sequence] = packet
+            heapq.heappush(
+                self._retrans_heap,
+                (packet.timestamp + self.rto, packet.header.sequence)
+            )
     
     def get_packets_to_send(self, max_packets: int = 10) -> list:
         """
@@ -321,35 +508,74 @@ class Connection:
         Returns:
             List of packets to send
         """
+        send_buffer = self.send_buffer
+        if not send_buffer:
+            return []
+
+        # Hoist the window budget and bound the drain up front; stats
+        # and bytes_in_flight are then updated once for the whole batch
+        budget = self.send_window - self.bytes_in_flight
+        n = min(max_packets, len(send_buffer))
         packets = []
-        
-        while self.send_buffer and len(packets) < max_packets:
-            # Check flow control window
-            in_flight = len(self.unacked_packets)
-            if in_flight >= self.send_window:
+        append = packets.append
+        popleft = send_buffer.popleft
+        bytes_out = 0
+        reliable_out = 0
+
+        for _ in range(n):
+            # The peer advertises its window in bytes, so gate on
+            # payload bytes in flight, not packets
+            next_size = len(send_buffer[0].payload)
+            if reliable_out + next_size > budget:
                 break
-            
-            packet = self.send_buffer.popleft()
-            packets.append(packet)
-            
-            # Update statistics
-            self.packets_sent += 1
-            self.bytes_sent += len(packet.payload)
-        
+            packet = popleft()
+            append(packet)
+            bytes_out += next_size
+            if packet.requires_ack():
+                reliable_out += next_size
+
+        self.packets_sent += len(packets)
+        self.bytes_sent += bytes_out
+        self.bytes_in_flight += reliable_out
+
         return packets
     
-    def get_packets_to_retransmit(self) -> list:
-        """Get packets that need retransmission."""
-        current_time = time.time()
+    def get_packets_to_retransmit(self, now: Optional[float] = None) -> list:
+        """Get packets that need retransmission.
+
+        Peeks the expiry heap instead of scanning every in-flight
+        packet, so polling is O(1) when nothing is due. A shared
+        monotonic `now` may be passed in by callers polling many
+        connections in one sweep.
+        """
+        current_time = _monotonic() if now is None else now
         packets = []
-        
-        for seq, packet in list(self.unacked_packets.items()):
-            if current_time - packet.timestamp > self.rto:
-                # Retransmit
-                packet.timestamp = current_time
-                packets.append(packet)
-                self.packets_retransmitted += 1
-        
+        heap = self._retrans_heap
+
+        while heap and heap[0][0] <= current_time:
+            _, seq = heapq.heappop(heap)
+            packet = self.unacked_packets.get(seq)
+            if packet is None:
+                # Already acknowledged; stale heap entry
+                continue
+            expiry = packet.timestamp + self.rto
+            if expiry > current_time:
+                # Timestamp or RTO moved since push; reschedule
+                heapq.heappush(heap, (expiry, seq))
+                continue
+            # Retransmit
+            packet.timestamp = current_time
+            packets.append(packet)
+            self.packets_retransmitted += 1
+            self._retransmitted_seqs.add(seq)
+            heapq.heappush(heap, (current_time + self.rto, seq))
+
+        # Flush a delayed ACK whose deadline has passed
+        if self._pending_ack_count and current_time >= self._ack_deadline:
+            self._pending_ack_count = 0
+            self._ack_deadline = 0.0
+            packets.append(self._make_ack())
+
         return packets
     
     def initiate_connection(self) -> Packet:
@@ -390,9 +616,15 @@ class Connection:
         """Check if connection is closed."""
         return self.state == ConnectionState.CLOSED
     
-    def is_timed_out(self, timeout: float = 60.0) -> bool:
-        """Check if connection has timed out."""
-        return time.time() - self.last_activity > timeout
+    def is_timed_out(self, timeout: float = 60.0, now: Optional[float] = None) -> bool:
+        """Check if connection has timed out.
+
+        Callers sweeping many connections can pass a shared monotonic
+        `now` so the whole sweep sees one consistent clock reading.
+        """
+        if now is None:
+            now = _monotonic()
+        return now - self.last_activity > timeout
     
     def get_stats(self) -> dict:
         """Get connection statistics."""
@@ -408,5 +640,6 @@ class Connection:
             'send_window': self.send_window,
             'recv_window': self.recv_window,
             'unacked_packets': len(self.unacked_packets),
-            'recv_buffer_size': len(self.recv_buffer),
+            'bytes_in_flight': self.bytes_in_flight,
+            'recv_buffer_size': self._recv_buffered,
         }
@@ -3,7 +3,6 @@ Flow control and congestion control mechanisms.
 """
 import time
 from typing import Optional
-from collections import deque
 
 
 class FlowController:
@@ -11,7 +10,12 @@ class FlowController:
     Implements flow control using sliding window.
     Prevents sender from overwhelming receiver.
     """
-    
+
+    __slots__ = (
+        'window_size', 'max_window', 'min_window',
+        'bytes_in_flight', 'receiver_window',
+    )
+
     def __init__(self, initial_window: int = 65535):
         """
         Initialize flow controller.
@@ -29,23 +33,43 @@ class FlowController:
         # Receiver's advertised window
         self.receiver_window = initial_window
     
+    def reserve(self, data_size: int) -> bool:
+        """
+        Atomically check the window and claim data_size bytes of it.
+
+        Folds can_send + on_send into one call so admission pays a
+        single window computation and there is no gap between the
+        check and the increment.
+
+        Args:
+            data_size: Size of data to send
+
+        Returns:
+            True if the bytes were reserved, False if the window is full
+        """
+        effective_window = min(self.window_size, self.receiver_window)
+        if self.bytes_in_flight + data_size > effective_window:
+            return False
+        self.bytes_in_flight += data_size
+        return True
+
     def can_send(self, data_size: int) -> bool:
         """
         Check if we can send data of given size.
-        
+
         Args:
             data_size: Size of data to send
-            
+
         Returns:
             True if we can send
         """
         effective_window = min(self.window_size, self.receiver_window)
         return self.bytes_in_flight + data_size <= effective_window
-    
+
     def on_send(self, data_size: int):
         """
         Called when data is sent.
-        
+
         Args:
             data_size: Size of data sent
         """
@@ -73,7 +97,16 @@ class CongestionController:
     Implements TCP-like congestion control.
     Uses slow start, congestion avoidance, fast retransmit, and fast recovery.
     """
-    
+
+    __slots__ = (
+        'mss', '_mss_sq', 'cwnd', 'ssthresh',
+        'in_slow_start', 'in_fast_recovery',
+        'last_ack', 'duplicate_ack_count',
+        'min_rtt', '_rtt_ring', '_rtt_idx', '_rtt_sum', '_rtt_count',
+        'last_loss_time',
+        'losses', 'fast_retransmits',
+    )
+
     def __init__(self, mss: int = 1400):
         """
         Initialize congestion controller.
@@ -82,7 +115,8 @@ class CongestionController:
             mss: Maximum segment size in bytes
         """
         self.mss = mss  # Maximum segment size
-        
+        self._mss_sq = mss * mss  # Precomputed for the per-ACK CA increment
+
         # Congestion window (in bytes)
         self.cwnd = mss  # Start with 1 MSS
         
@@ -97,9 +131,13 @@ class CongestionController:
         self.last_ack = 0
         self.duplicate_ack_count = 0
         
-        # RTT tracking for congestion
+        # RTT tracking for congestion: ring of the last 3 samples with a
+        # rolling sum, so the congestion test is O(1) with no copies
         self.min_rtt = float('inf')
-        self.rtt_measurements = deque(maxlen=10)
+        self._rtt_ring = [0.0, 0.0, 0.0]
+        self._rtt_idx = 0
+        self._rtt_sum = 0.0
+        self._rtt_count = 0
         
         # Timestamps
         self.last_loss_time = 0
@@ -120,8 +158,13 @@ class CongestionController:
             rtt: Round-trip time for this ACK (optional)
         """
         if rtt:
-            self.rtt_measurements.append(rtt)
-            self.min_rtt = min(self.min_rtt, rtt)
+            idx = self._rtt_idx
+            self._rtt_sum += rtt - self._rtt_ring[idx]
+            self._rtt_ring[idx] = rtt
+            self._rtt_idx = 0 if idx == 2 else idx + 1
+            self._rtt_count += 1
+            if rtt < self.min_rtt:
+                self.min_rtt = rtt
         
         if self.in_fast_recovery:
             # Exit fast recovery
@@ -137,8 +180,7 @@ class CongestionController:
         else:
             # Congestion avoidance: increase cwnd by MSS * (MSS / cwnd) per ACK
             # This gives linear increase instead of exponential
-            increment = self.mss * self.mss / self.cwnd
-            self.cwnd += increment
+            self.cwnd += self._mss_sq / self.cwnd
         
         # Reset duplicate ACK counter
         self.duplicate_ack_count = 0
@@ -201,11 +243,11 @@ class CongestionController:
         Returns:
             True if congestion detected
         """
-        if len(self.rtt_measurements) < 5:
+        if self._rtt_count < 5:
             return False
-        
-        recent_rtt = sum(list(self.rtt_measurements)[-3:]) / 3
-        return recent_rtt > self.min_rtt * 1.5
+
+        # Mean of the last 3 samples > 1.5x min RTT, via the rolling sum
+        return self._rtt_sum > self.min_rtt * 4.5
     
     def get_stats(self) -> dict:
         """Get congestion control statistics."""
@@ -221,11 +263,33 @@ class CongestionController:
         }
 
 
+def scan_congested(controllers) -> list:
+    """
+    Batch congestion check over many controllers.
+
+    Reads the rolling-sum fields directly instead of calling
+    is_network_congested() per controller, so a scheduler sweeping
+    thousands of flows pays one function call for the whole sweep.
+
+    Args:
+        controllers: Iterable of CongestionController instances
+
+    Returns:
+        List of booleans, one per controller, in iteration order
+    """
+    return [
+        c._rtt_count >= 5 and c._rtt_sum > c.min_rtt * 4.5
+        for c in controllers
+    ]
+
+
 class AdaptiveFlowController:
     """
     Adaptive flow control that combines flow control and congestion control.
     """
-    
+
+    __slots__ = ('flow_controller', 'congestion_controller')
+
     def __init__(self, mss: int = 1400, initial_window: int = 65535):
         """
         Initialize adaptive flow controller.
@@ -239,14 +303,29 @@ class AdaptiveFlowController:
     
     def can_send(self, data_size: int) -> bool:
         """Check if we can send data."""
-        # Respect both flow control and congestion control
-        flow_ok = self.flow_controller.can_send(data_size)
-        
-        congestion_window = self.congestion_controller.get_send_window()
-        congestion_ok = self.flow_controller.bytes_in_flight + data_size <= congestion_window
-        
-        return flow_ok and congestion_ok
-    
+        # Respect both flow control and congestion control: one fused
+        # window computation instead of two delegated checks
+        fc = self.flow_controller
+        effective = min(
+            fc.window_size,
+            fc.receiver_window,
+            int(self.congestion_controller.cwnd),
+        )
+        return fc.bytes_in_flight + data_size <= effective
+
+    def reserve(self, data_size: int) -> bool:
+        """Atomically check both windows and claim data_size bytes."""
+        fc = self.flow_controller
+        effective = min(
+            fc.window_size,
+            fc.receiver_window,
+            int(self.congestion_controller.cwnd),
+        )
+        if fc.bytes_in_flight + data_size > effective:
+            return False
+        fc.bytes_in_flight += data_size
+        return True
+
     def on_send(self, data_size: int):
         """Called when data is sent."""
         self.flow_controller.on_send(data_size)
@@ -266,9 +345,13 @@ class AdaptiveFlowController:
     
     def get_effective_window(self) -> int:
         """Get effective send window."""
-        flow_window = self.flow_controller.get_available_window()
-        congestion_window = self.congestion_controller.get_send_window()
-        return min(flow_window, congestion_window)
+        fc = self.flow_controller
+        effective = min(
+            fc.window_size,
+            fc.receiver_window,
+            int(self.congestion_controller.cwnd),
+        )
+        return max(0, effective - fc.bytes_in_flight)
     
     def get_stats(self) -> dict:
         """Get combined statistics."""
@@ -5,9 +5,16 @@ import struct
 import zlib
 import time
 from enum import IntEnum
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Optional, List
 import hashlib
+import random
+
+try:
+    # Optional libdeflate bindings: faster DEFLATE, same wire format
+    import deflate as _libdeflate
+except ImportError:
+    _libdeflate = None
 
 
 class PacketType(IntEnum):
@@ -40,30 +47,59 @@ class PacketFlags(IntEnum):
     RST = 0x100              # Reset connection flag (compatibility)
 
 
-@dataclass
+# Header layout precompiled once, so pack/unpack skip format-string
+# parsing per call. All multi-byte fields sit on their natural
+# alignment (32 bytes total); the checksum field is at byte 16 (after
+# magic, version, type, flags, reserved, window, sequence, ack) so
+# to_bytes can patch it into an already-packed buffer.
+_HDR_STRUCT = struct.Struct('!HBBBBHIIIIIHH')
+_HEADER_PACK_INTO = _HDR_STRUCT.pack_into
+_CHECKSUM_PACK_INTO = struct.Struct('!I').pack_into
+_LEN_PACK_INTO = struct.Struct('!I').pack_into
+_CHECKSUM_OFFSET = 16
+_CHECKSUM_END = _CHECKSUM_OFFSET + 4
+_ZERO_CHECKSUM = bytes(4)
+
+
+# Control packet types as a bitmask over the (small) type space: the
+# membership test is a shift and AND, no hashing
+_CONTROL_MASK = sum(1 << int(t) for t in (
+    PacketType.SYN,
+    PacketType.SYN_ACK,
+    PacketType.FIN,
+    PacketType.FIN_ACK,
+    PacketType.ACK,
+    PacketType.PING,
+    PacketType.PONG,
+    PacketType.FLOW_CONTROL,
+    PacketType.ERROR,
+))
+
+
+@dataclass(slots=True)
 class PacketHeader:
     """
     Packet header structure (32 bytes fixed size).
-    
-    Format:
+
+    Format (all fields naturally aligned):
     - Magic (2 bytes): 0xBEEF (protocol identifier)
     - Version (1 byte): Protocol version
     - Type (1 byte): Packet type
     - Flags (1 byte): Packet flags
     - Reserved (1 byte): Reserved for future use
+    - Window (2 bytes): Flow control window size
     - Sequence (4 bytes): Sequence number
     - Ack (4 bytes): Acknowledgment number
-    - Window (2 bytes): Flow control window size
     - Checksum (4 bytes): CRC32 checksum
     - Payload Length (4 bytes): Length of payload
     - Fragment ID (4 bytes): Fragment identifier (0 if not fragmented)
     - Fragment Offset (2 bytes): Offset in original message
     - Fragment Total (2 bytes): Total fragments
     """
-    
+
     MAGIC = 0xBEEF
-    VERSION = 0x01
-    HEADER_SIZE = 28  # Actual struct size
+    VERSION = 0x02
+    HEADER_SIZE = _HDR_STRUCT.size  # Exactly 32 bytes
     
     packet_type: int
     flags: int = 0
@@ -75,7 +111,17 @@ class PacketHeader:
     fragment_id: int = 0
     fragment_offset: int = 0
     fragment_total: int = 0
-    
+
+    def __post_init__(self):
+        """Normalize enum members to plain ints.
+
+        Received headers already carry bare ints from struct.unpack;
+        coercing locally created ones keeps comparisons and dispatch
+        lookups on the packet path free of enum __eq__/__hash__ calls.
+        """
+        self.packet_type = int(self.packet_type)
+        self.flags = int(self.flags)
+
     # Compatibility properties for tests
     @property
     def sequence_number(self) -> int:
@@ -99,16 +145,16 @@ class PacketHeader:
     
     def to_bytes(self) -> bytes:
         """Serialize header to bytes."""
-        return struct.pack(
-            '!HBBBHIHHIBIHH',    # Network byte order (big-endian)
+        return _HDR_STRUCT.pack(
+            # Network byte order (big-endian)
             self.MAGIC,           # Magic number (H = 2 bytes)
             self.VERSION,         # Protocol version (B = 1 byte)
             self.packet_type,     # Packet type (B = 1 byte)
             self.flags,           # Flags (B = 1 byte)
-            0,                    # Reserved (B = 1 byte) + padding (B = 1 byte) -> H = 2 bytes
+            0,                    # Reserved (B = 1 byte)
+            self.window_size,     # Window size (H = 2 bytes)
             self.sequence,        # Sequence number (I = 4 bytes)
             self.ack_number,      # Ack number (I = 4 bytes)
-            self.window_size,     # Window size (H = 2 bytes)
             self.checksum,        # Checksum (I = 4 bytes)
             self.payload_length,  # Payload length (I = 4 bytes)
             self.fragment_id,     # Fragment ID (I = 4 bytes)
@@ -121,20 +167,19 @@ class PacketHeader:
         """Deserialize header from bytes."""
         if len(data) < cls.HEADER_SIZE:
             return None
-        
+
+        # Fast-reject on the raw magic/version bytes before paying for
+        # the full 13-field unpack
+        if data[0] != 0xBE or data[1] != 0xEF or data[2] != cls.VERSION:
+            return None
+
         try:
-            unpacked = struct.unpack('!HBBBHIHHIBIHH', data[:cls.HEADER_SIZE])
-            
-            magic, version, pkt_type, flags, _, seq, ack, window, \
+            # unpack_from avoids slicing a fresh bytes object per packet
+            unpacked = _HDR_STRUCT.unpack_from(data, 0)
+
+            _, _, pkt_type, flags, _, window, seq, ack, \
                 checksum, payload_len, frag_id, frag_offset, frag_total = unpacked
-            
-            # Validate magic number and version
-            if magic != cls.MAGIC:
-                return None
-            
-            if version != cls.VERSION:
-                return None
-            
+
             return cls(
                 packet_type=pkt_type,
                 flags=flags,
@@ -151,31 +196,30 @@ class PacketHeader:
             return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Packet:
     """Complete packet with header and payload."""
     
+    # timestamp starts at 0.0 rather than time.time(): the reliable
+    # send path stamps packets when they are queued, and nothing reads
+    # the timestamp before then, so construction skips the clock call.
     header: PacketHeader
     payload: bytes = b''
-    timestamp: float = field(default_factory=time.time)
-    
+    timestamp: float = 0.0
+
     MAX_PAYLOAD_SIZE = 65507 - PacketHeader.HEADER_SIZE  # Max UDP - header
     MTU_SAFE_SIZE = 1472 - PacketHeader.HEADER_SIZE      # MTU safe size
     
-    def __post_init__(self):
-        """Update header with payload information."""
-        self.header.payload_length = len(self.payload)
-    
     def compute_checksum(self) -> int:
         """Compute CRC32 checksum of header + payload."""
         # Temporarily set checksum to 0
         original_checksum = self.header.checksum
         self.header.checksum = 0
-        
-        # Compute checksum
-        header_bytes = self.header.to_bytes()
-        checksum = zlib.crc32(header_bytes + self.payload) & 0xFFFFFFFF
-        
+
+        # Feed the CRC incrementally via zlib's seed argument instead
+        # of materializing a header+payload concatenation
+        checksum = zlib.crc32(self.payload, zlib.crc32(self.header.to_bytes())) & 0xFFFFFFFF
+
         # Restore and return
         self.header.checksum = original_checksum
         return checksum
@@ -186,13 +230,56 @@ class Packet:
         computed_checksum = self.compute_checksum()
         return stored_checksum == computed_checksum
     
+    def _serialize_into(self, buf: bytearray, offset: int):
+        """Pack header and payload into buf at offset and patch the CRC.
+
+        The packet must occupy the rest of the buffer from offset on.
+        """
+        header = self.header
+        _HEADER_PACK_INTO(
+            buf, offset,
+            PacketHeader.MAGIC,
+            PacketHeader.VERSION,
+            header.packet_type,
+            header.flags,
+            0,
+            header.window_size,
+            header.sequence,
+            header.ack_number,
+            0,  # checksum computed over the zeroed field below
+            header.payload_length,
+            header.fragment_id,
+            header.fragment_offset,
+            header.fragment_total,
+        )
+        buf[offset + PacketHeader.HEADER_SIZE:] = self.payload
+        checksum = zlib.crc32(memoryview(buf)[offset:]) & 0xFFFFFFFF
+        header.checksum = checksum
+        _CHECKSUM_PACK_INTO(buf, offset + _CHECKSUM_OFFSET, checksum)
+
     def to_bytes(self) -> bytes:
-        """Serialize complete packet to bytes."""
-        # Compute and set checksum
-        self.header.checksum = self.compute_checksum()
-        
-        # Serialize
-        return self.header.to_bytes() + self.payload
+        """Serialize complete packet to bytes.
+
+        Packs header and payload into a single buffer and patches the
+        CRC in place, instead of building the header twice and
+        concatenating header+payload twice (once for the checksum,
+        once for the wire bytes).
+        """
+        buf = bytearray(PacketHeader.HEADER_SIZE + len(self.payload))
+        self._serialize_into(buf, 0)
+        return bytes(buf)
+
+    def to_framed_bytes(self) -> bytes:
+        """Serialize with a 4-byte length prefix for stream transports.
+
+        The prefix is written into the same buffer as the packet, so a
+        framed send is one allocation and one write.
+        """
+        total = PacketHeader.HEADER_SIZE + len(self.payload)
+        buf = bytearray(4 + total)
+        _LEN_PACK_INTO(buf, 0, total)
+        self._serialize_into(buf, 4)
+        return bytes(buf)
     
     @classmethod
     def from_bytes(cls, data: bytes) -> Optional['Packet']:
@@ -208,34 +295,58 @@ class Packet:
         # Extract payload
         payload_start = PacketHeader.HEADER_SIZE
         payload_end = payload_start + header.payload_length
-        
+
         if len(data) < payload_end:
             return None
-        
+
         payload = data[payload_start:payload_end]
-        
-        # Create packet
-        packet = cls(header=header, payload=payload)
-        
-        # Verify checksum
-        if not packet.verify_checksum():
-            raise ValueError("Packet checksum verification failed")
-        
-        return packet
+
+        # Verify the CRC over the received buffer directly (with the
+        # checksum field zeroed) instead of re-packing the parsed
+        # header just to feed it back through compute_checksum
+        mv = memoryview(data)
+        checksum = zlib.crc32(mv[:_CHECKSUM_OFFSET])
+        checksum = zlib.crc32(_ZERO_CHECKSUM, checksum)
+        checksum = zlib.crc32(mv[_CHECKSUM_END:payload_end], checksum)
+        if checksum & 0xFFFFFFFF != header.checksum:
+            # Corrupt packets are dropped like any other malformed
+            # buffer; raising here would cost an exception per bad
+            # packet under lossy or adversarial traffic
+            return None
+
+        return cls(header=header, payload=payload)
     
     def compress(self):
         """Compress packet payload."""
         if not (self.header.flags & PacketFlags.COMPRESSED):
-            compressed = zlib.compress(self.payload, level=6)
+            payload = self.payload
+            # Too small to win back the header overhead
+            if len(payload) < 128:
+                return
+            # Cheap entropy probe: nearly all-distinct bytes in the
+            # first 64 means compressed/encrypted data; skip DEFLATE
+            if len(set(payload[:64])) > 56:
+                return
+            if _libdeflate is not None:
+                compressed = _libdeflate.zlib_compress(self.payload, 6)
+            else:
+                compressed = zlib.compress(self.payload, level=6)
             if len(compressed) < len(self.payload):
                 self.payload = compressed
                 self.header.flags |= PacketFlags.COMPRESSED
                 self.header.payload_length = len(self.payload)
-    
+
     def decompress(self):
         """Decompress packet payload."""
         if self.header.flags & PacketFlags.COMPRESSED:
-            self.payload = zlib.decompress(self.payload)
+            if _libdeflate is not None:
+                # libdeflate needs an output bound; uncompressed payloads
+                # never exceed MAX_PAYLOAD_SIZE by construction
+                self.payload = _libdeflate.zlib_decompress(
+                    self.payload, self.MAX_PAYLOAD_SIZE
+                )
+            else:
+                self.payload = zlib.decompress(self.payload)
             self.header.flags &= ~PacketFlags.COMPRESSED
             self.header.payload_length = len(self.payload)
     
@@ -269,6 +380,36 @@ class Packet:
             window_size=window_size
         )
         return cls(header=header)
+
+    @staticmethod
+    def encode_ack_fast(ack_number: int, window_size: int = 65535) -> bytes:
+        """Encode a bare ACK frame directly to wire bytes.
+
+        Patches the ack number and window into a pre-packed 32-byte
+        template and recomputes the CRC, skipping header construction
+        and full struct packing for the most common packet on the wire.
+        """
+        buf = bytearray(_ACK_TEMPLATE)
+        _ACK_WINDOW_PACK_INTO(buf, _ACK_WINDOW_OFFSET, window_size)
+        _ACK_NUMBER_PACK_INTO(buf, _ACK_NUMBER_OFFSET, ack_number)
+        _CHECKSUM_PACK_INTO(buf, _CHECKSUM_OFFSET, zlib.crc32(buf) & 0xFFFFFFFF)
+        return bytes(buf)
+
+    def reset_as_ack(self, ack_number: int, window_size: int = 65535):
+        """Reinitialize this packet in place as a fresh ACK (for pooling)."""
+        header = self.header
+        header.packet_type = PacketType.ACK
+        header.flags = 0
+        header.sequence = 0
+        header.ack_number = ack_number
+        header.window_size = window_size
+        header.checksum = 0
+        header.payload_length = 0
+        header.fragment_id = 0
+        header.fragment_offset = 0
+        header.fragment_total = 0
+        self.payload = b''
+        self.timestamp = 0.0
     
     @classmethod
     def create_data(
@@ -290,19 +431,21 @@ class Packet:
             packet_type=PacketType.DATA,
             flags=flags,
             sequence=sequence,
-            ack_number=ack_number
+            ack_number=ack_number,
+            payload_length=len(payload)
         )
         return cls(header=header, payload=payload)
     
     @classmethod
     def create_ping(cls, sequence: int) -> 'Packet':
         """Create ping packet."""
+        # Include timestamp in payload
+        timestamp = struct.pack('!d', time.time())
         header = PacketHeader(
             packet_type=PacketType.PING,
-            sequence=sequence
+            sequence=sequence,
+            payload_length=len(timestamp)
         )
-        # Include timestamp in payload
-        timestamp = struct.pack('!d', time.time())
         return cls(header=header, payload=timestamp)
     
     @classmethod
@@ -310,7 +453,8 @@ class Packet:
         """Create pong packet in response to ping."""
         header = PacketHeader(
             packet_type=PacketType.PONG,
-            sequence=sequence
+            sequence=sequence,
+            payload_length=len(ping_payload)
         )
         return cls(header=header, payload=ping_payload)
     
@@ -326,18 +470,7 @@ class Packet:
     
     def is_control_packet(self) -> bool:
         """Check if this is a control packet."""
-        control_types = {
-            PacketType.SYN,
-            PacketType.SYN_ACK,
-            PacketType.FIN,
-            PacketType.FIN_ACK,
-            PacketType.ACK,
-            PacketType.PING,
-            PacketType.PONG,
-            PacketType.FLOW_CONTROL,
-            PacketType.ERROR
-        }
-        return self.header.packet_type in control_types
+        return (_CONTROL_MASK >> self.header.packet_type) & 1 == 1
     
     def requires_ack(self) -> bool:
         """Check if packet requires acknowledgment."""
@@ -350,18 +483,55 @@ class Packet:
                 f"len={self.header.payload_length})")
 
 
+# Pre-packed ACK header (zero checksum); encode_ack_fast patches the
+# window (H at byte 6) and ack number (I at byte 12) fields in place
+_ACK_TEMPLATE = PacketHeader(packet_type=PacketType.ACK).to_bytes()
+_ACK_WINDOW_PACK_INTO = struct.Struct('!H').pack_into
+_ACK_WINDOW_OFFSET = 6
+_ACK_NUMBER_PACK_INTO = struct.Struct('!I').pack_into
+_ACK_NUMBER_OFFSET = 12
+
+
+class _ReassemblyState:
+    """In-progress reassembly of one fragmented message.
+
+    Fragments are written in place into one preallocated bytearray and
+    tracked with a bitmask, so completing a message is a trim rather
+    than a join over N small payloads.
+    """
+
+    __slots__ = ('buf', 'mask', 'timestamp', 'count', 'total',
+                 'chunk_size', 'last_len', 'early')
+
+    def __init__(self, total: int):
+        self.buf: Optional[bytearray] = None
+        self.mask = 0
+        self.timestamp = time.time()
+        self.count = 0
+        self.total = total
+        # All fragments but the last share the sender's chunk size,
+        # learned from the first full-size fragment to arrive
+        self.chunk_size = 0
+        self.last_len = 0
+        # Fragments that arrive before the chunk size is known
+        self.early: Optional[dict] = None
+
+
 class PacketFragmenter:
     """Handles fragmentation and reassembly of large messages."""
-    
+
     def __init__(self, mtu: int = Packet.MTU_SAFE_SIZE):
         """
         Initialize fragmenter.
-        
+
         Args:
             mtu: Maximum transmission unit (payload size)
         """
         self.mtu = mtu
-        self.reassembly_buffer: dict = {}  # fragment_id -> {offset -> fragment}
+        self.reassembly_buffer: dict = {}  # fragment_id -> _ReassemblyState
+        # Fragment IDs come from a wrapping counter seeded randomly at
+        # boot; hashing the payload would re-scan the whole buffer
+        self._next_frag_id = random.randint(0, 0xFFFFFFFF)
     
     def fragment(self, payload: bytes, sequence: int = 0, flags: int = 0) -> List[Packet]:
         """
@@ -380,12 +550,17 @@ class PacketFragmenter:
             return [Packet.create_data(sequence, payload)]
         
         fragments = []
-        fragment_id = hash(payload) & 0xFFFFFFFF  # Use hash as fragment ID
+        fragment_id = self._next_frag_id
+        self._next_frag_id = (fragment_id + 1) & 0xFFFFFFFF
         total_fragments = (len(payload) + self.mtu - 1) // self.mtu
-        
+
+        # Slice through a memoryview so each chunk is a zero-copy view
+        # of the input; to_bytes copies it straight into the wire buffer
+        mv = memoryview(payload)
+
         for i in range(total_fragments):
             offset = i * self.mtu
-            chunk = payload[offset:offset + self.mtu]
+            chunk = mv[offset:offset + self.mtu]
             
             frag_flags = flags | PacketFlags.FRAGMENTED
             if i == total_fragments - 1:
@@ -395,6 +570,7 @@ class PacketFragmenter:
                 packet_type=PacketType.FRAGMENT,
                 flags=frag_flags,
                 sequence=sequence + i,
+                payload_length=len(chunk),
                 fragment_id=fragment_id,
                 fragment_offset=i,
                 fragment_total=total_fragments
@@ -407,43 +583,66 @@ class PacketFragmenter:
     def reassemble(self, packet: Packet) -> Optional[bytes]:
         """
         Reassemble fragmented packet.
-        
+
         Args:
             packet: Fragment packet
-            
+
         Returns:
-            Complete payload if all fragments received, None otherwise
+            Complete payload if all fragments received, None otherwise.
+            A completed multi-fragment message comes back as the
+            reassembly bytearray itself (bytes-like, never reused).
         """
-        if not (packet.header.flags & PacketFlags.FRAGMENTED):
+        header = packet.header
+        if not (header.flags & PacketFlags.FRAGMENTED):
             return packet.payload
-        
-        fragment_id = packet.header.fragment_id
-        
-        # Initialize reassembly buffer for this fragment ID
-        if fragment_id not in self.reassembly_buffer:
-            self.reassembly_buffer[fragment_id] = {
-                'fragments': {},
-                'total': packet.header.fragment_total,
-                'timestamp': time.time()
-            }
-        
-        buffer = self.reassembly_buffer[fragment_id]
-        
-        # Store fragment
-        buffer['fragments'][packet.header.fragment_offset] = packet.payload
-        
-        # Check if we have all fragments
-        if len(buffer['fragments']) == buffer['total']:
-            # Reassemble in order
-            payload = b''.join(
-                buffer['fragments'][i] for i in range(buffer['total'])
-            )
-            
-            # Clean up
+
+        fragment_id = header.fragment_id
+        state = self.reassembly_buffer.get(fragment_id)
+        if state is None:
+            state = _ReassemblyState(header.fragment_total)
+            self.reassembly_buffer[fragment_id] = state
+
+        offset = header.fragment_offset
+        bit = 1 << offset
+        if state.mask & bit:
+            # Duplicate fragment
+            return None
+        state.mask |= bit
+        state.count += 1
+
+        payload = packet.payload
+        is_last = offset == state.total - 1
+        if is_last:
+            state.last_len = len(payload)
+
+        if state.buf is None:
+            if is_last and state.total > 1:
+                # The short tail fragment arrived first; park it until
+                # a full-size fragment reveals the chunk size
+                if state.early is None:
+                    state.early = {}
+                state.early[offset] = payload
+                return None
+            state.chunk_size = len(payload)
+            state.buf = bytearray(state.chunk_size * state.total)
+            if state.early:
+                for early_offset, early_payload in state.early.items():
+                    start = early_offset * state.chunk_size
+                    state.buf[start:start + len(early_payload)] = early_payload
+                state.early = None
+
+        start = offset * state.chunk_size
+        state.buf[start:start + len(payload)] = payload
+
+        if state.count == state.total:
             del self.reassembly_buffer[fragment_id]
-            
-            return payload
-        
+            size = state.chunk_size * (state.total - 1) + state.last_len
+            del state.buf[size:]
+            # The state is dropped above, so nothing else references
+            # the buffer; hand it out directly rather than copying it
+            # into a fresh bytes object
+            return state.buf
+
         return None
     
     def add_fragment(self, packet: Packet) -> Optional[bytes]:
@@ -462,8 +661,8 @@ class PacketFragmenter:
         """Remove stale reassembly buffers."""
         current_time = time.time()
         stale_ids = [
-            frag_id for frag_id, buffer in self.reassembly_buffer.items()
-            if current_time - buffer['timestamp'] > timeout
+            frag_id for frag_id, state in self.reassembly_buffer.items()
+            if current_time - state.timestamp > timeout
         ]
         
         for frag_id in stale_ids:
@@ -3,11 +3,17 @@ TCP-based transport layer (improved over the basic network.py).
 """
 import asyncio
 from typing import Optional, Dict, Callable, Tuple
-from positron_networking.transport.packet import Packet, PacketFragmenter
+from positron_networking.transport.packet import Packet, PacketType, PacketFragmenter
 from positron_networking.transport.connection import Connection
 import struct
 
 
+_FRAGMENT = int(PacketType.FRAGMENT)
+
+# Guard against hostile length prefixes (max 10MB)
+_MAX_FRAME = 10 * 1024 * 1024
+
+
 class TCPTransport:
     """
     TCP-based transport with packet framing.
@@ -147,11 +153,17 @@ class TCPTransport:
             connection_id: Connection identifier
             payload: Data to send
         """
-        # Fragment if needed
+        connection = self.connections.get(connection_id)
+        if not connection:
+            raise ValueError(f"No connection: {connection_id}")
+
+        # Fragment if needed, then write all fragments as one batch
+        # with a single drain instead of one await per fragment
         packets = self.fragmenter.fragment(payload, 0)
-        
-        for packet in packets:
-            await self.send_packet(connection_id, packet)
+        await connection.send_packets(packets)
+
+        self.stats['packets_sent'] += len(packets)
+        self.stats['bytes_sent'] += sum(len(p.payload) for p in packets)
     
     async def close_connection(self, connection_id: str):
         """
@@ -219,23 +231,42 @@ class TCPConnection:
         self._lock = asyncio.Lock()
     
     async def send_packet(self, packet: Packet):
-        """Send packet over TCP with length framing."""
+        """Send packet over TCP with length framing.
+
+        Lock-free: writelines hands both buffers to the transport in
+        one call, which cannot interleave with other writes on the
+        event loop, so only the multi-call send_packets path needs the
+        lock.
+        """
+        if not self.is_open:
+            raise ConnectionError("Connection closed")
+
+        try:
+            # The length prefix is serialized into the packet buffer
+            # itself, so the frame is one allocation and one write
+            self.writer.write(packet.to_framed_bytes())
+            await self.writer.drain()
+
+        except Exception as e:
+            self.is_open = False
+            raise e
+
+    async def send_packets(self, packets: list):
+        """Send multiple packets under one lock with a single drain."""
         async with self._lock:
             if not self.is_open:
                 raise ConnectionError("Connection closed")
-            
+
             try:
-                data = packet.to_bytes()
-                
-                # Send length prefix (4 bytes)
-                length = struct.pack('>I', len(data))
-                self.writer.write(length + data)
+                self.writer.writelines(
+                    [packet.to_framed_bytes() for packet in packets]
+                )
                 await self.writer.drain()
-                
+
             except Exception as e:
                 self.is_open = False
                 raise e
-    
+
     async def receive_packet(self) -> Optional[Packet]:
         """Receive packet from TCP connection."""
         try:
@@ -243,8 +274,8 @@ class TCPConnection:
             length_data = await self.reader.readexactly(4)
             length = struct.unpack('>I', length_data)[0]
             
-            # Validate length (max 10MB)
-            if length > 10 * 1024 * 1024:
+            # Validate length
+            if length > _MAX_FRAME:
                 raise ValueError("Packet too large")
             
             # Read packet data
@@ -262,28 +293,60 @@ class TCPConnection:
             raise e
     
     async def receive_loop(self):
-        """Receive packets in a loop."""
+        """Receive packets in a loop.
+
+        Reads the socket in large chunks into one accumulator and
+        parses length-prefixed frames out of it, instead of paying two
+        readexactly awaits (and two allocations) per packet; one read
+        can yield many packets.
+        """
+        buf = bytearray()
+        length = -1  # body length once the prefix is parsed
         while self.is_open:
             try:
-                packet = await self.receive_packet()
-                if packet is None:
+                chunk = await self.reader.read(65536)
+                if not chunk:
+                    self.is_open = False
                     break
-                
-                self.transport.stats['packets_received'] += 1
-                self.transport.stats['bytes_received'] += len(packet.payload)
-                
-                # Handle fragmentation
-                if packet.header.packet_type == packet.header.packet_type.FRAGMENT:
-                    payload = self.transport.fragmenter.reassemble(packet)
-                    if payload and self.transport.on_packet_callback:
-                        packet.payload = payload
-                        await self.transport.on_packet_callback(packet)
-                elif self.transport.on_packet_callback:
-                    await self.transport.on_packet_callback(packet)
-                
+                buf += chunk
+
+                while True:
+                    if length < 0:
+                        if len(buf) < 4:
+                            break
+                        length = int.from_bytes(buf[:4], 'big')
+                        if length > _MAX_FRAME:
+                            raise ValueError("Packet too large")
+                    if len(buf) < 4 + length:
+                        break
+                    frame = bytes(buf[4:4 + length])
+                    del buf[:4 + length]
+                    length = -1
+
+                    packet = Packet.from_bytes(frame)
+                    if packet is None:
+                        continue
+                    await self._dispatch_packet(packet)
+
             except Exception as e:
                 print(f"Error receiving from {self.peer_addr}: {e}")
+                self.is_open = False
+                self.transport.stats['errors'] += 1
                 break
+
+    async def _dispatch_packet(self, packet: Packet):
+        """Hand a received packet to the transport callbacks."""
+        self.transport.stats['packets_received'] += 1
+        self.transport.stats['bytes_received'] += len(packet.payload)
+
+        # Handle fragmentation
+        if packet.header.packet_type == _FRAGMENT:
+            payload = self.transport.fragmenter.reassemble(packet)
+            if payload and self.transport.on_packet_callback:
+                packet.payload = payload
+                await self.transport.on_packet_callback(packet)
+        elif self.transport.on_packet_callback:
+            await self.transport.on_packet_callback(packet)
     
     async def close(self):
         """Close the TCP connection."""
@@ -2,13 +2,39 @@
 UDP-based transport layer with reliability and ordering options.
 """
 import asyncio
-from typing import Optional, Dict, Callable, Tuple
+from typing import Optional, Dict, Callable, List, Tuple
+import errno
+import os
 import socket
+import struct
+import sys
 from positron_networking.transport.packet import Packet, PacketType, PacketFragmenter
 from positron_networking.transport.connection import Connection, ConnectionState
 import time
 
 
+# Packet types compared on the ingress path, as plain ints to match the
+# normalized header field without enum dispatch
+_SYN = int(PacketType.SYN)
+_ACK = int(PacketType.ACK)
+_FRAGMENT = int(PacketType.FRAGMENT)
+
+# UDP generic segmentation offload: one sendmsg carries many equal-size
+# datagrams and the kernel splits them (Linux 4.18+). The constant is
+# not exposed by every Python build, so fall back to its kernel value.
+_UDP_SEGMENT = getattr(socket, 'UDP_SEGMENT', 103)
+_GSO_SUPPORTED = sys.platform == 'linux'
+# Kernel cap on segments per GSO send (UDP_MAX_SEGMENTS)
+_GSO_MAX_SEGMENTS = 64
+# errnos that mean the kernel/path cannot do GSO at all, as opposed to
+# transient send failures (EAGAIN on a full buffer, EINTR) that should
+# not latch GSO off for the transport's lifetime
+_GSO_UNSUPPORTED_ERRNOS = frozenset(
+    getattr(errno, name) for name in ('EINVAL', 'EOPNOTSUPP', 'ENOTSUP')
+    if hasattr(errno, name)
+)
+
+
 class UDPTransport:
     """
     UDP-based transport with optional reliability.
@@ -19,26 +45,44 @@ class UDPTransport:
         self,
         host: str = "0.0.0.0",
         port: int = 0,
-        mtu: int = 1472
+        mtu: int = 1472,
+        rcvbuf: int = 4 << 20,
+        sndbuf: int = 4 << 20,
+        reuse_port: bool = False
     ):
         """
         Initialize UDP transport.
-        
+
         Args:
             host: Host to bind to
             port: Port to bind to (0 for random)
             mtu: Maximum transmission unit
+            rcvbuf: Kernel receive buffer size (SO_RCVBUF); the ~208KB
+                Linux default drops datagrams under bursts
+            sndbuf: Kernel send buffer size (SO_SNDBUF)
+            reuse_port: Set SO_REUSEPORT so multiple processes can
+                bind the same port (one receive queue per core)
         """
         self.host = host
         self.port = port
         self.mtu = mtu
+        self.rcvbuf = rcvbuf
+        self.sndbuf = sndbuf
+        self.reuse_port = reuse_port
         
         # Socket and transport
         self.transport: Optional[asyncio.DatagramTransport] = None
         self.protocol: Optional['UDPProtocol'] = None
+        # Raw socket for scatter-gather sends of large payloads
+        self._sock: Optional[socket.socket] = None
+        # Cleared on the first failed GSO send so unsupported kernels
+        # only pay for the probe once
+        self._gso_enabled = _GSO_SUPPORTED
         
-        # Connections (for reliable mode)
-        self.connections: Dict[str, Connection] = {}
+        # Connections (for reliable mode), keyed by (host, port) so
+        # the hot receive path hashes the addr tuple directly instead
+        # of formatting a "host:port" string per datagram
+        self.connections: Dict[Tuple[str, int], Connection] = {}
         
         # Fragmenter
         self.fragmenter = PacketFragmenter(mtu=mtu)
@@ -49,6 +93,25 @@ class UDPTransport:
         
         # Background tasks
         self._maintenance_task: Optional[asyncio.Task] = None
+        # Monotonic deadline for the next stale-fragment sweep
+        self._next_cleanup = 0.0
+
+        # Bounded receive queue drained by a fixed worker pool, so a
+        # datagram burst costs queue puts rather than one new Task per
+        # packet, and overload drops at the queue instead of piling up
+        self._rx_queue: Optional[asyncio.Queue] = None
+        self._rx_workers: List[asyncio.Task] = []
+
+        # Per-type handlers for packets without a connection; one dict
+        # get replaces the if/elif cascade on the receive path
+        self._rx_dispatch: Dict[int, Callable] = {
+            _SYN: self._handle_new_syn,
+            _FRAGMENT: self._handle_fragment,
+        }
+
+        # Connections with a drain callback already scheduled, so bursts
+        # of sends coalesce into one event-loop wakeup per connection
+        self._drain_pending: set = set()
         
         # Statistics
         self.stats = {
@@ -66,17 +129,38 @@ class UDPTransport:
         # Create protocol
         self.protocol = UDPProtocol(self)
         
-        # Create UDP endpoint
+        # Create UDP endpoint; SO_REUSEPORT has to be applied before
+        # bind, which the event loop handles for us
         self.transport, _ = await loop.create_datagram_endpoint(
             lambda: self.protocol,
-            local_addr=(self.host, self.port)
+            local_addr=(self.host, self.port),
+            reuse_port=self.reuse_port or None
         )
-        
+
         # Get actual bound port
         sock = self.transport.get_extra_info('socket')
         if sock:
             self.port = sock.getsockname()[1]
-        
+            # Grow the kernel buffers past the distribution defaults;
+            # best effort, the kernel clamps to net.core.*mem_max
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+            except OSError:
+                pass
+            # asyncio wraps the socket and hides sendmsg; duplicate the
+            # fd into a real socket object for scatter-gather sends
+            self._sock = socket.socket(
+                sock.family, sock.type, sock.proto,
+                fileno=os.dup(sock.fileno())
+            )
+        
+        # Start receive workers
+        self._rx_queue = asyncio.Queue(maxsize=4096)
+        self._rx_workers = [
+            asyncio.create_task(self._rx_worker()) for _ in range(4)
+        ]
+
         # Start maintenance task
         self._maintenance_task = asyncio.create_task(self._maintenance_loop())
         
@@ -91,6 +175,13 @@ class UDPTransport:
                 await self._maintenance_task
             except asyncio.CancelledError:
                 pass
+
+        # Stop receive workers
+        for worker in self._rx_workers:
+            worker.cancel()
+        if self._rx_workers:
+            await asyncio.gather(*self._rx_workers, return_exceptions=True)
+            self._rx_workers = []
         
         # Close all connections
         for connection in list(self.connections.values()):
@@ -99,6 +190,11 @@ class UDPTransport:
         # Close transport
         if self.transport:
             self.transport.close()
+
+        # Close the duplicated send socket
+        if self._sock:
+            self._sock.close()
+            self._sock = None
     
     def send_packet(self, packet: Packet, addr: Tuple[str, int]):
         """
@@ -110,26 +206,92 @@ class UDPTransport:
         """
         if not self.transport:
             return
-        
-        data = packet.to_bytes()
+
+        header = packet.header
+        payload = packet.payload
+        if header.packet_type == _ACK and not payload:
+            # Bare ACKs dominate reliable traffic; encode them from the
+            # pre-packed template instead of full serialization
+            data = Packet.encode_ack_fast(header.ack_number, header.window_size)
+        elif self._sock is not None and len(payload) >= 1024:
+            # Large payloads go out scatter-gather: header and payload
+            # as two buffers, skipping the copy into one wire buffer
+            header.checksum = packet.compute_checksum()
+            header_bytes = header.to_bytes()
+            try:
+                self._sock.sendmsg((header_bytes, payload), (), 0, addr)
+            except (BlockingIOError, InterruptedError):
+                # Kernel buffer full; UDP may drop
+                pass
+            self.stats['packets_sent'] += 1
+            self.stats['bytes_sent'] += len(header_bytes) + len(payload)
+            return
+        else:
+            data = packet.to_bytes()
         self.transport.sendto(data, addr)
-        
+
         self.stats['packets_sent'] += 1
         self.stats['bytes_sent'] += len(data)
     
     def send_unreliable(self, payload: bytes, addr: Tuple[str, int]):
         """
         Send data unreliably (no retransmission, no ordering).
-        
+
         Args:
             payload: Data to send
             addr: Destination address
         """
         # Fragment if needed
         packets = self.fragmenter.fragment(payload, 0)
-        
+
+        # Multi-fragment sends go out via GSO where the kernel
+        # supports it: one syscall instead of one per fragment
+        if (len(packets) > 1 and self._gso_enabled
+                and self._sock is not None
+                and self._send_gso(packets, addr)):
+            return
+
         for packet in packets:
             self.send_packet(packet, addr)
+
+    def _send_gso(self, packets: list, addr: Tuple[str, int]) -> bool:
+        """Send pre-fragmented packets as one segmented buffer.
+
+        The fragmenter emits equal-size fragments with a shorter tail,
+        which matches UDP_SEGMENT semantics exactly: the kernel cuts
+        the concatenated buffer every seg_size bytes. Returns False so
+        the caller can fall back to per-fragment sendto; a capability
+        error (EINVAL/EOPNOTSUPP) additionally disables further GSO
+        attempts, while transient errors fall back for this send only.
+        """
+        wire = [packet.to_bytes() for packet in packets]
+        seg_size = len(wire[0])
+        if any(len(w) != seg_size for w in wire[1:-1]) or len(wire[-1]) > seg_size:
+            return False
+
+        cmsg = [(socket.IPPROTO_UDP, _UDP_SEGMENT, struct.pack('H', seg_size))]
+        sent = 0
+        try:
+            # The kernel caps segments per call; batch accordingly
+            for start in range(0, len(wire), _GSO_MAX_SEGMENTS):
+                batch = wire[start:start + _GSO_MAX_SEGMENTS]
+                self._sock.sendmsg([b''.join(batch)], cmsg, 0, addr)
+                sent += len(batch)
+        except OSError as e:
+            # Only a capability error disables GSO for good; a full
+            # send buffer (EAGAIN) or interrupted call falls back for
+            # this send only
+            if e.errno in _GSO_UNSUPPORTED_ERRNOS:
+                self._gso_enabled = False
+            if sent == 0:
+                return False
+            # Partially sent: let the remainder go out one at a time
+            for packet in packets[sent:]:
+                self.send_packet(packet, addr)
+
+        self.stats['packets_sent'] += sent
+        self.stats['bytes_sent'] += sum(len(w) for w in wire[:sent])
+        return True
     
     async def connect(self, addr: Tuple[str, int]) -> Optional[str]:
         """
@@ -141,38 +303,39 @@ class UDPTransport:
         Returns:
             Connection ID if successful, None otherwise
         """
-        connection_id = f"{addr[0]}:{addr[1]}"
-        
-        if connection_id in self.connections:
-            return connection_id
-        
+        existing = self.connections.get(addr)
+        if existing:
+            return existing.connection_id
+
         # Create connection
         connection = Connection(
-            connection_id=connection_id,
+            connection_id=f"{addr[0]}:{addr[1]}",
             local_addr=(self.host, self.port),
             remote_addr=addr
         )
-        
+
         # Set callbacks
         connection.on_packet_callback = self._on_connection_packet
-        
-        self.connections[connection_id] = connection
-        
+
+        self.connections[addr] = connection
+
         # Send SYN
         syn = connection.initiate_connection()
         self.send_packet(syn, addr)
-        
-        # Wait for connection to establish
-        for _ in range(30):  # 3 second timeout
-            await asyncio.sleep(0.1)
-            if connection.is_established():
-                if self.on_connection_callback:
-                    await self.on_connection_callback(connection_id, 'connected')
-                return connection_id
-        
-        # Connection failed
-        del self.connections[connection_id]
-        return None
+
+        # Wait for the SYN-ACK to flip the state; the event fires
+        # immediately instead of being noticed on a 100ms poll
+        try:
+            await asyncio.wait_for(connection.established_event.wait(), timeout=3.0)
+        except asyncio.TimeoutError:
+            # Connection failed
+            del self.connections[addr]
+            return None
+        connection_id = connection.connection_id
+
+        if self.on_connection_callback:
+            await self.on_connection_callback(connection_id, 'connected')
+        return connection_id
     
     async def send_reliable(self, connection_id: str, payload: bytes):
         """
@@ -182,7 +345,7 @@ class UDPTransport:
             connection_id: Connection identifier
             payload: Data to send
         """
-        connection = self.connections.get(connection_id)
+        connection = self.connections.get(self._parse_connection_id(connection_id))
         if not connection or not connection.is_established():
             raise ValueError(f"No established connection: {connection_id}")
         
@@ -197,9 +360,9 @@ class UDPTransport:
         for packet in packets:
             packet.header.sequence = connection.get_next_sequence()
             connection.send_packet(packet)
-        
+
         # Trigger sending
-        await self._send_connection_packets(connection)
+        self._schedule_drain(connection)
     
     async def close_connection(self, connection_id: str):
         """
@@ -208,83 +371,150 @@ class UDPTransport:
         Args:
             connection_id: Connection identifier
         """
-        connection = self.connections.get(connection_id)
+        addr = self._parse_connection_id(connection_id)
+        connection = self.connections.get(addr)
         if not connection:
             return
-        
+
         # Send FIN
         fin = connection.close_connection()
         self.send_packet(fin, connection.remote_addr)
-        
+
         # Wait for close to complete
-        for _ in range(30):
-            await asyncio.sleep(0.1)
-            if connection.is_closed():
-                break
-        
+        try:
+            await asyncio.wait_for(connection.closed_event.wait(), timeout=3.0)
+        except asyncio.TimeoutError:
+            pass
+
         # Remove connection
-        if connection_id in self.connections:
-            del self.connections[connection_id]
-            
+        if addr in self.connections:
+            del self.connections[addr]
+
             if self.on_connection_callback:
                 await self.on_connection_callback(connection_id, 'closed')
     
+    async def _rx_worker(self):
+        """Drain the receive queue; one of a small fixed pool."""
+        queue = self._rx_queue
+        while True:
+            try:
+                packet, addr, datagram_len = await queue.get()
+                await self._handle_packet(packet, addr, datagram_len)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Error handling UDP packet: {e}")
+                self.stats['errors'] += 1
+
+    @staticmethod
+    def _parse_connection_id(connection_id: str) -> Tuple[str, int]:
+        """Parse a "host:port" connection ID into the addr-tuple key.
+
+        Only API boundaries pay this parse; the per-datagram path
+        looks connections up by the addr tuple directly.
+        """
+        host, _, port = connection_id.rpartition(':')
+        return (host, int(port))
+
     def _on_connection_packet(self, packet: Packet):
         """Callback when connection receives a complete packet."""
         if self.on_packet_callback:
             asyncio.create_task(self.on_packet_callback(packet))
     
-    async def _handle_packet(self, packet: Packet, addr: Tuple[str, int]):
-        """Handle incoming packet."""
-        self.stats['packets_received'] += 1
-        self.stats['bytes_received'] += len(packet.to_bytes())
-        
-        # Check if it's for an existing connection
-        connection_id = f"{addr[0]}:{addr[1]}"
-        connection = self.connections.get(connection_id)
-        
-        if connection:
+    async def _handle_packet(
+        self,
+        packet: Packet,
+        addr: Tuple[str, int],
+        datagram_len: int
+    ):
+        """Handle incoming packet.
+
+        `datagram_len` is the wire size of the datagram the packet was
+        parsed from; counting it directly avoids re-serializing the
+        packet just to measure it.
+        """
+        stats = self.stats
+        stats['packets_received'] += 1
+        stats['bytes_received'] += datagram_len
+
+        # Check if it's for an existing connection; the addr tuple is
+        # the key, so no string is formatted on this path
+        connection = self.connections.get(addr)
+
+        if connection is not None:
             # Handle with connection
             response = connection.handle_packet(packet)
             if response:
                 self.send_packet(response, addr)
-        else:
-            # Handle new connection or unreliable packet
-            if packet.header.packet_type == PacketType.SYN:
-                # Incoming connection
-                connection = Connection(
-                    connection_id=connection_id,
-                    local_addr=(self.host, self.port),
-                    remote_addr=addr
-                )
-                connection.on_packet_callback = self._on_connection_packet
-                self.connections[connection_id] = connection
-                
-                response = connection.handle_packet(packet)
-                if response:
-                    self.send_packet(response, addr)
-                
-                if self.on_connection_callback:
-                    await self.on_connection_callback(connection_id, 'accepted')
-            
-            elif packet.is_control_packet():
-                # Control packet without connection - ignore
-                pass
-            else:
-                # Unreliable data packet
-                if packet.header.packet_type == PacketType.FRAGMENT:
-                    # Try to reassemble
-                    payload = self.fragmenter.reassemble(packet)
-                    if payload and self.on_packet_callback:
-                        packet.payload = payload
-                        await self.on_packet_callback(packet)
-                elif self.on_packet_callback:
-                    await self.on_packet_callback(packet)
+                # sendto copied the bytes; the ACK can be reused
+                connection.release_packet(response)
+            if connection.send_buffer:
+                # An ACK may have opened the window; drain promptly
+                # instead of waiting for the maintenance tick
+                self._schedule_drain(connection)
+            return
+
+        # No connection: dispatch on packet type instead of walking an
+        # if/elif cascade per datagram
+        handler = self._rx_dispatch.get(
+            packet.header.packet_type, self._handle_unconnected
+        )
+        await handler(packet, addr)
+
+    async def _handle_new_syn(self, packet: Packet, addr: Tuple[str, int]):
+        """Accept an incoming connection."""
+        connection = Connection(
+            connection_id=f"{addr[0]}:{addr[1]}",
+            local_addr=(self.host, self.port),
+            remote_addr=addr
+        )
+        connection.on_packet_callback = self._on_connection_packet
+        self.connections[addr] = connection
+
+        response = connection.handle_packet(packet)
+        if response:
+            self.send_packet(response, addr)
+
+        if self.on_connection_callback:
+            await self.on_connection_callback(connection.connection_id, 'accepted')
+
+    async def _handle_fragment(self, packet: Packet, addr: Tuple[str, int]):
+        """Reassemble an unreliable fragment."""
+        payload = self.fragmenter.reassemble(packet)
+        if payload and self.on_packet_callback:
+            packet.payload = payload
+            await self.on_packet_callback(packet)
+
+    async def _handle_unconnected(self, packet: Packet, addr: Tuple[str, int]):
+        """Default handler: unreliable data up, stray control dropped."""
+        if packet.is_control_packet():
+            # Control packet without connection - ignore
+            return
+        if self.on_packet_callback:
+            await self.on_packet_callback(packet)
     
+    def _schedule_drain(self, connection: Connection):
+        """Schedule one event-loop callback to drain a connection's send
+        buffer; repeated calls before it runs are no-ops."""
+        connection_id = connection.connection_id
+        if connection_id in self._drain_pending:
+            return
+        self._drain_pending.add(connection_id)
+        asyncio.get_event_loop().call_soon(self._drain_connection, connection)
+
+    def _drain_connection(self, connection: Connection):
+        """Send everything the window allows in a single callback."""
+        self._drain_pending.discard(connection.connection_id)
+        queued = len(connection.send_buffer)
+        if not queued:
+            return
+        for packet in connection.get_packets_to_send(max_packets=queued):
+            self.send_packet(packet, connection.remote_addr)
+
     async def _send_connection_packets(self, connection: Connection):
         """Send queued packets for a connection."""
         packets = connection.get_packets_to_send()
-        
+
         for packet in packets:
             self.send_packet(packet, connection.remote_addr)
     
@@ -293,25 +523,40 @@ class UDPTransport:
         while True:
             try:
                 await asyncio.sleep(0.1)  # 100ms
-                
-                current_time = time.time()
-                
-                for connection_id, connection in list(self.connections.items()):
-                    # Send queued packets
-                    await self._send_connection_packets(connection)
-                    
-                    # Handle retransmissions
-                    retransmit_packets = connection.get_packets_to_retransmit()
-                    for packet in retransmit_packets:
+
+                # One clock read per tick, shared across every connection
+                now = time.monotonic()
+
+                conns = list(self.connections.values())
+
+                # Send queued packets for all connections concurrently
+                # rather than awaiting each in turn; one slow drain no
+                # longer stretches the whole tick
+                if conns:
+                    await asyncio.gather(
+                        *(self._send_connection_packets(c) for c in conns),
+                        return_exceptions=True
+                    )
+
+                timed_out = []
+                for connection in conns:
+                    # Handle retransmissions (synchronous)
+                    for packet in connection.get_packets_to_retransmit(now):
                         self.send_packet(packet, connection.remote_addr)
-                    
+
                     # Check for timeout
-                    if connection.is_timed_out(timeout=60.0):
-                        await self.close_connection(connection_id)
-                
-                # Cleanup stale fragment buffers
-                if int(current_time) % 30 == 0:  # Every 30 seconds
+                    if connection.is_timed_out(timeout=60.0, now=now):
+                        timed_out.append(connection.connection_id)
+
+                for connection_id in timed_out:
+                    await self.close_connection(connection_id)
+
+                # Cleanup stale fragment buffers every 30 seconds; a
+                # deadline fires exactly once, where the old
+                # int(now) % 30 check could miss or double-fire
+                if now >= self._next_cleanup:
                     self.fragmenter.cleanup_stale()
+                    self._next_cleanup = now + 30.0
                 
             except asyncio.CancelledError:
                 break
@@ -325,15 +570,17 @@ class UDPTransport:
             **self.stats,
             'connections': len(self.connections),
             'connection_stats': {
-                conn_id: conn.get_stats()
-                for conn_id, conn in self.connections.items()
+                conn.connection_id: conn.get_stats()
+                for conn in self.connections.values()
             }
         }
 
 
 class UDPProtocol(asyncio.DatagramProtocol):
     """Asyncio UDP protocol handler."""
-    
+
+    __slots__ = ('transport_layer',)
+
     def __init__(self, transport_layer: UDPTransport):
         self.transport_layer = transport_layer
         super().__init__()
@@ -342,8 +589,13 @@ class UDPProtocol(asyncio.DatagramProtocol):
         """Handle received datagram."""
         # Parse packet
         packet = Packet.from_bytes(data)
-        if packet:
-            asyncio.create_task(self.transport_layer._handle_packet(packet, addr))
+        if packet is None:
+            return
+        try:
+            self.transport_layer._rx_queue.put_nowait((packet, addr, len(data)))
+        except asyncio.QueueFull:
+            # Overloaded; shed at the queue like a full socket buffer
+            self.transport_layer.stats['errors'] += 1
     
     def error_received(self, exc: Exception):
         """Handle error."""
@@ -1,14 +1,23 @@
 """
 Trust and reputation management system for network peers.
 """
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
+from collections import OrderedDict, deque
 from positron_networking.protocol import PeerInfo
 from positron_networking.storage import Storage
 import time
 import asyncio
+import bisect
 import math
 
 
+# How long the sorted trust projection may serve reads before being
+# rebuilt from storage. Trust writes through TrustManager invalidate it
+# immediately; the TTL bounds staleness from writes that bypass it
+# (PeerManager's periodic save_peer upserts trust_score directly).
+_SORTED_TRUST_TTL = 5.0
+
+
 class TrustManager:
     """Manages trust scores and reputation for network peers."""
     
@@ -19,11 +28,12 @@ class TrustManager:
         min_trust: float = 0.1,
         max_trust: float = 1.0,
         decay_rate: float = 0.01,
-        decay_interval: float = 300.0
+        decay_interval: float = 300.0,
+        cache_maxsize: int = 100_000
     ):
         """
         Initialize trust manager.
-        
+
         Args:
             storage: Storage instance for persisting trust data
             initial_trust: Initial trust score for new peers
@@ -31,6 +41,9 @@ class TrustManager:
             max_trust: Maximum trust score
             decay_rate: Trust decay rate per interval
             decay_interval: Interval between trust decay operations
+            cache_maxsize: Ceiling on cached trust entries; adversaries
+                can synthesize node IDs cheaply, so the cache must not
+                grow with every ID ever observed
         """
         self.storage = storage
         self.initial_trust = initial_trust
@@ -38,19 +51,34 @@ class TrustManager:
         self.max_trust = max_trust
         self.decay_rate = decay_rate
         self.decay_interval = decay_interval
+        self.cache_maxsize = cache_maxsize
+
+        # In-memory trust cache for performance (LRU, bounded)
+        self.trust_cache: 'OrderedDict[str, float]' = OrderedDict()
         
-        # In-memory trust cache for performance
-        self.trust_cache: Dict[str, float] = {}
-        
-        # Track recent interactions
-        self.interaction_history: Dict[str, List[float]] = {}
+        # Track recent interactions (bounded per peer; the deque
+        # evicts the oldest entry in O(1) instead of list.pop(0))
+        self.interaction_history: Dict[str, Deque[float]] = {}
         
+        # Message counters accumulated in memory and flushed to
+        # storage once a second instead of one write per message
+        self._stat_pending: Dict[str, List[int]] = {}
+
+        # Peers sorted ascending by trust, built lazily and dropped on
+        # any trust write (and after _SORTED_TRUST_TTL regardless), so
+        # repeated get_trusted_peers calls cost a binary search instead
+        # of a table scan
+        self._sorted_trust: Optional[tuple] = None
+        self._sorted_trust_at = 0.0
+
         self._decay_task: Optional[asyncio.Task] = None
-    
+        self._stats_flush_task: Optional[asyncio.Task] = None
+
     async def start(self):
         """Start trust management background tasks."""
         self._decay_task = asyncio.create_task(self._trust_decay_loop())
-    
+        self._stats_flush_task = asyncio.create_task(self._stats_flush_loop())
+
     async def stop(self):
         """Stop trust management background tasks."""
         if self._decay_task:
@@ -59,6 +87,14 @@ class TrustManager:
                 await self._decay_task
             except asyncio.CancelledError:
                 pass
+        if self._stats_flush_task:
+            self._stats_flush_task.cancel()
+            try:
+                await self._stats_flush_task
+            except asyncio.CancelledError:
+                pass
+        # Don't lose counts accumulated since the last flush
+        await self._flush_peer_stats()
     
     async def get_trust(self, node_id: str) -> float:
         """
@@ -70,14 +106,17 @@ class TrustManager:
         Returns:
             Trust score (0.0 - 1.0)
         """
-        if node_id in self.trust_cache:
-            return self.trust_cache[node_id]
-        
+        cache = self.trust_cache
+        cached = cache.get(node_id)
+        if cached is not None:
+            cache.move_to_end(node_id)
+            return cached
+
         peer = await self.storage.get_peer(node_id)
         if peer:
-            self.trust_cache[node_id] = peer.trust_score
+            self._cache_trust(node_id, peer.trust_score)
             return peer.trust_score
-        
+
         return self.initial_trust
     
     async def set_trust(self, node_id: str, trust_score: float, reason: str = ""):
@@ -91,12 +130,30 @@ class TrustManager:
         """
         old_trust = await self.get_trust(node_id)
         trust_score = max(0.0, min(self.max_trust, trust_score))
-        
-        self.trust_cache[node_id] = trust_score
+        await self._write_trust(node_id, trust_score, reason, old_trust)
+
+    async def _write_trust(
+        self,
+        node_id: str,
+        trust_score: float,
+        reason: str,
+        old_trust: float
+    ):
+        """Persist an already-clamped trust score.
+
+        Callers that have just fetched and clamped the score use this
+        directly, skipping set_trust's redundant re-fetch and re-clamp.
+        """
+        delta = trust_score - old_trust
+        if abs(delta) < 1e-6:
+            # Nothing effectively changed; skip the write and the log
+            return
+
+        self._sorted_trust = None
+        self._cache_trust(node_id, trust_score)
         await self.storage.update_peer_trust(node_id, trust_score)
-        
+
         # Log the trust change
-        delta = trust_score - old_trust
         await self.storage.log_trust_event(node_id, "set_trust", delta, reason)
     
     async def adjust_trust(self, node_id: str, delta: float, reason: str = ""):
@@ -110,7 +167,7 @@ class TrustManager:
         """
         current = await self.get_trust(node_id)
         new_trust = max(0.0, min(self.max_trust, current + delta))
-        await self.set_trust(node_id, new_trust, reason)
+        await self._write_trust(node_id, new_trust, reason, current)
     
     async def on_valid_message(self, node_id: str, boost: float = 0.001):
         """
@@ -121,8 +178,8 @@ class TrustManager:
             boost: Trust boost amount
         """
         await self.adjust_trust(node_id, boost, "valid_message")
-        await self.storage.increment_peer_stats(node_id, valid_messages=1)
-        
+        self._count_message(node_id, 0)
+
         # Track interaction
         self._record_interaction(node_id, boost)
     
@@ -135,8 +192,8 @@ class TrustManager:
             penalty: Trust penalty amount
         """
         await self.adjust_trust(node_id, -penalty, "invalid_message")
-        await self.storage.increment_peer_stats(node_id, invalid_messages=1)
-        
+        self._count_message(node_id, 1)
+
         # Track interaction
         self._record_interaction(node_id, -penalty)
     
@@ -183,10 +240,24 @@ class TrustManager:
             min_trust: Minimum trust threshold
             
         Returns:
-            List of trusted peer information
+            List of trusted peer information, most trusted first
         """
         threshold = min_trust or 0.7
-        return await self.storage.get_trusted_peers(threshold)
+
+        now = time.monotonic()
+        cached = self._sorted_trust
+        if cached is None or now - self._sorted_trust_at > _SORTED_TRUST_TTL:
+            peers = await self.storage.get_all_peers()
+            peers.sort(key=lambda p: p.trust_score)
+            scores = [p.trust_score for p in peers]
+            cached = self._sorted_trust = (scores, peers)
+            self._sorted_trust_at = now
+
+        scores, peers = cached
+        idx = bisect.bisect_left(scores, threshold)
+        trusted = peers[idx:]
+        trusted.reverse()  # most trusted first, matching the old SQL order
+        return trusted
     
     async def apply_transitive_trust(
         self,
@@ -213,16 +284,56 @@ class TrustManager:
             f"recommendation_from_{recommender_id}"
         )
     
+    def _count_message(self, node_id: str, slot: int):
+        """Accumulate a message count (slot 0 valid, 1 invalid)."""
+        pending = self._stat_pending.get(node_id)
+        if pending is None:
+            pending = self._stat_pending[node_id] = [0, 0]
+        pending[slot] += 1
+
+    async def _flush_peer_stats(self):
+        """Push accumulated message counts to storage in one batch."""
+        if not self._stat_pending:
+            return
+        pending, self._stat_pending = self._stat_pending, {}
+        await self.storage.bulk_increment_peer_stats(
+            {node_id: (valid, invalid)
+             for node_id, (valid, invalid) in pending.items()}
+        )
+
+    async def _stats_flush_loop(self):
+        """Background task flushing message counters once a second."""
+        while True:
+            try:
+                await asyncio.sleep(1.0)
+                await self._flush_peer_stats()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"Error in stats flush loop: {e}")
+
+    def _cache_trust(self, node_id: str, trust_score: float):
+        """Cache a trust score, evicting the least recently used
+        entry once the cache is full."""
+        cache = self.trust_cache
+        if node_id in cache:
+            cache[node_id] = trust_score
+            cache.move_to_end(node_id)
+            return
+        if len(cache) >= self.cache_maxsize:
+            cache.popitem(last=False)
+        cache[node_id] = trust_score
+
     def _record_interaction(self, node_id: str, value: float):
-        """Record an interaction for trend analysis."""
-        if node_id not in self.interaction_history:
-            self.interaction_history[node_id] = []
-        
-        self.interaction_history[node_id].append(value)
-        
-        # Keep only recent history (last 100 interactions)
-        if len(self.interaction_history[node_id]) > 100:
-            self.interaction_history[node_id].pop(0)
+        """Record an interaction for trend analysis.
+
+        Keeps only the last 100 interactions per peer; maxlen makes
+        the eviction part of the append.
+        """
+        history = self.interaction_history.get(node_id)
+        if history is None:
+            history = self.interaction_history[node_id] = deque(maxlen=100)
+        history.append(value)
     
     def get_interaction_trend(self, node_id: str) -> float:
         """
@@ -238,20 +349,25 @@ class TrustManager:
             return 0.0
         
         history = self.interaction_history[node_id]
-        if len(history) < 2:
-            return 0.0
-        
-        # Simple linear regression slope
         n = len(history)
-        x_mean = n / 2
-        y_mean = sum(history) / n
-        
-        numerator = sum((i - x_mean) * (history[i] - y_mean) for i in range(n))
-        denominator = sum((i - x_mean) ** 2 for i in range(n))
-        
-        if denominator == 0:
+        if n < 2:
             return 0.0
-        
+
+        # Simple linear regression slope, fused into one pass: the
+        # numerator reduces algebraically to sum(i*y) minus the mean
+        # of i = 0..n-1 times sum(y), and the denominator around
+        # x_mean = n/2 has the closed form n*(n*n + 2)/12
+        sum_y = 0.0
+        sum_iy = 0.0
+        i = 0
+        for y in history:
+            sum_y += y
+            sum_iy += i * y
+            i += 1
+
+        numerator = sum_iy - ((n - 1) / 2) * sum_y
+        denominator = n * (n * n + 2) / 12
+
         return numerator / denominator
     
     async def _trust_decay_loop(self):
@@ -267,19 +383,38 @@ class TrustManager:
                 print(f"Error in trust decay loop: {e}")
     
     async def _apply_trust_decay(self):
-        """Apply trust decay to all peers."""
+        """Apply trust decay to all peers.
+
+        Updates are collected and written as one storage transaction
+        with a single aggregate event, instead of two round-trips per
+        peer; with thousands of peers the per-peer version blocks the
+        decay loop for seconds.
+        """
         peers = await self.storage.get_all_peers()
-        
-        for peer in peers:
-            # Decay trust towards the initial trust value
-            current = peer.trust_score
-            target = self.initial_trust
-            
-            # Exponential decay towards target
-            new_trust = current + (target - current) * self.decay_rate
-            
-            if abs(new_trust - current) > 0.001:  # Only update if significant change
-                await self.set_trust(peer.node_id, new_trust, "periodic_decay")
+
+        # Exponential decay towards the initial trust value; with the
+        # per-interval rate hoisted, the per-peer step and its
+        # significance delta reduce to one multiply each
+        rate = self.decay_rate
+        target_rate = self.initial_trust * rate
+        one_minus_rate = 1.0 - rate
+        changes = [
+            (peer.node_id,
+             peer.trust_score * one_minus_rate + target_rate,
+             (self.initial_trust - peer.trust_score) * rate)
+            for peer in peers
+            if abs(self.initial_trust - peer.trust_score) * rate > 0.001
+        ]
+
+        if changes:
+            await self.storage.bulk_update_peer_trust(changes, reason="periodic_decay")
+            self._sorted_trust = None
+            # Refresh cached entries in place; decay is not a "use",
+            # so it neither admits new entries nor reorders the LRU
+            cache = self.trust_cache
+            for node_id, trust, _ in changes:
+                if node_id in cache:
+                    cache[node_id] = trust
     
     async def compute_reputation_score(self, node_id: str) -> float:
         """
@@ -286,10 +286,9 @@ class TestBloomFilterPerformance:
         bf = BloomFilter(expected_elements=100000, false_positive_rate=0.001)
         
         start_time = time.time()
-        
-        for i in range(100000):
-            bf.add(f"item_{i}")
-        
+
+        bf.add_many(f"item_{i}" for i in range(100000))
+
         elapsed = time.time() - start_time
         
         # Should complete in reasonable time (adjust based on hardware)
@@ -305,11 +304,11 @@ class TestBloomFilterPerformance:
             bf.add(f"item_{i}")
         
         start_time = time.time()
-        
+
         # Lookup all items
-        for i in range(10000):
-            assert f"item_{i}" in bf
-        
+        results = bf.contains_many(f"item_{i}" for i in range(10000))
+        assert all(results)
+
         elapsed = time.time() - start_time
         
         # Lookups should be fast
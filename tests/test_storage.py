@@ -0,0 +1,143 @@
+"""
+Tests for the write-coalescing storage layer.
+"""
+import pytest
+import asyncio
+import os
+import tempfile
+import time
+
+from positron_networking.storage import Storage
+from positron_networking.protocol import PeerInfo
+
+
+def make_peer(node_id: str = "peer_1", trust_score: float = 0.5) -> PeerInfo:
+    """Build a PeerInfo for storage tests."""
+    return PeerInfo(
+        node_id=node_id,
+        address="127.0.0.1:9000",
+        public_key=b"k" * 32,
+        last_seen=time.time(),
+        trust_score=trust_score,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_peer_sees_queued_save():
+    """A read inside the coalescing window must see the queued save.
+
+    Regression test: the writer pops a batch off the queue and sleeps
+    flush_interval holding it; flush() used to drain only what was
+    still queued, making the in-hand batch invisible to readers.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = Storage(os.path.join(tmpdir, "test.db"))
+        await storage.initialize()
+
+        await storage.save_peer(make_peer())
+        # Land inside the writer's 50ms coalescing sleep
+        await asyncio.sleep(0.01)
+
+        peer = await storage.get_peer("peer_1")
+        assert peer is not None
+        assert peer.node_id == "peer_1"
+
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_peer_list_readers_see_queued_save():
+    """The list/columnar readers must also flush the in-hand batch."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = Storage(os.path.join(tmpdir, "test.db"))
+        await storage.initialize()
+
+        await storage.save_peer(make_peer("peer_a", trust_score=0.9))
+        await asyncio.sleep(0.01)
+
+        all_peers = await storage.get_all_peers()
+        assert [p.node_id for p in all_peers] == ["peer_a"]
+
+        trusted = await storage.get_trusted_peers(min_trust=0.7)
+        assert [p.node_id for p in trusted] == ["peer_a"]
+
+        columns = await storage.get_peers_columnar()
+        assert columns["node_id"] == ["peer_a"]
+
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_update_peer_trust_after_queued_save():
+    """update_peer_trust must not no-op against a still-queued INSERT.
+
+    Regression test: the direct UPDATE used to commit against a table
+    missing the queued peer row, and the batch then committed the
+    stale trust score over it — a lost trust write.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = Storage(os.path.join(tmpdir, "test.db"))
+        await storage.initialize()
+
+        await storage.save_peer(make_peer(trust_score=0.5))
+        await storage.update_peer_trust("peer_1", 0.9)
+        # Let any straggling batch commit behind the update
+        await asyncio.sleep(storage.flush_interval * 2)
+
+        peer = await storage.get_peer("peer_1")
+        assert peer is not None
+        assert peer.trust_score == pytest.approx(0.9)
+
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_remove_peer_wins_over_queued_save():
+    """A queued save_peer must not resurrect a removed peer."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = Storage(os.path.join(tmpdir, "test.db"))
+        await storage.initialize()
+
+        await storage.save_peer(make_peer())
+        await storage.remove_peer("peer_1")
+        await asyncio.sleep(storage.flush_interval * 2)
+
+        assert await storage.get_peer("peer_1") is None
+
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_close_persists_queued_writes():
+    """close() must commit writes still coalescing in the writer."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        storage = Storage(db_path)
+        await storage.initialize()
+        await storage.save_peer(make_peer())
+        await asyncio.sleep(0.01)
+        await storage.close()
+
+        reopened = Storage(db_path)
+        await reopened.initialize()
+        peer = await reopened.get_peer("peer_1")
+        assert peer is not None
+        assert peer.node_id == "peer_1"
+        await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_writer_commits_without_explicit_flush():
+    """The background writer alone must persist writes within the window."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = Storage(os.path.join(tmpdir, "test.db"))
+        await storage.initialize()
+
+        await storage.mark_message_seen(b"m" * 32, "sender_1")
+        await asyncio.sleep(storage.flush_interval * 3)
+
+        # The pending set drains once the writer has committed the row
+        assert not storage._pending_seen
+        assert await storage.has_seen_message(b"m" * 32)
+
+        await storage.close()
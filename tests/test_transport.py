@@ -75,12 +75,11 @@ class TestPacket:
         restored = Packet.from_bytes(data)
         assert restored.payload == packet.payload
         
-        # Corrupt data
+        # Corrupt data is dropped, not raised
         corrupted = bytearray(data)
         corrupted[40] ^= 0xFF  # Flip bits in payload
-        
-        with pytest.raises(ValueError, match="checksum"):
-            Packet.from_bytes(bytes(corrupted))
+
+        assert Packet.from_bytes(bytes(corrupted)) is None
     
     def test_packet_flags(self):
         """Test packet flags."""